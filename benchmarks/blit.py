@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from benchmarks.run import HISTORY_PATH, append_history
+from core.animation import AnimationManager, MANIFEST
+from core.variants import read_manifest, state_paths
+from core.screen import ScreenManager
+
+def strips():
+    for unit_type, spec in read_manifest(MANIFEST).items():
+        for state, strip in spec["states"].items():
+            yield unit_type, state, os.path.join(spec["folder"], strip + ".png")
+    for enemy_type in read_manifest().values():
+        name = os.path.basename(enemy_type["folder"])
+        for state, path in state_paths(enemy_type).items():
+            yield name, state, path
+
+def time_blits(target, frames, blits):
+    # cycle through the strip like an animation would, at a fixed spot on the lane
+    n = len(frames)
+    start = time.perf_counter()
+    for i in range(blits):
+        target.blit(frames[i % n], (400, 200))
+    return 1e6 * (time.perf_counter() - start) / blits
+
+def measure(target, path, blits):
+    start = time.perf_counter()
+    raw = AnimationManager.load_sprite_strip(path)
+    raw_ms = 1000 * (time.perf_counter() - start)
+    start = time.perf_counter()
+    prepared = AnimationManager.prepare_strip(raw)
+    prepare_ms = 1000 * (time.perf_counter() - start)
+    cell_px = sum(f.get_width() * f.get_height() for f in raw)
+    trimmed_px = sum(f.get_width() * f.get_height() for f in prepared)
+    return {
+        "mode": "colorkey" if prepared[0].get_colorkey() else "alpha",
+        "frames": len(raw),
+        "fill_saved": 1 - trimmed_px / cell_px,
+        "raw_us": time_blits(target, raw, blits),
+        "prepared_us": time_blits(target, prepared, blits),
+        "load_ms": raw_ms,
+        "prepare_ms": prepare_ms,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-strip blit cost of raw strip cells against trimmed, encoded sprite frames")
+    parser.add_argument("--blits", type=int, default=2000, help="blits timed per strip and variant")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON lines file results are appended to")
+    parser.add_argument("--no-history", action="store_true", help="do not record results")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    target = pygame.display.set_mode((ScreenManager.WIDTH, ScreenManager.HEIGHT))
+    target.fill(ScreenManager.WHITE)
+    rows = [(unit, state, measure(target, path, args.blits)) for unit, state, path in strips()]
+
+    print(f"{'strip':<22} {'mode':<8} {'fill saved':>10} {'raw us':>8} {'prepared us':>12} {'speedup':>8} {'load ms':>8} {'prepare ms':>10}")
+    for unit, state, r in rows:
+        print(f"{unit + ' ' + state:<22} {r['mode']:<8} {100 * r['fill_saved']:9.0f}% {r['raw_us']:8.2f} "
+              f"{r['prepared_us']:12.2f} {r['raw_us'] / r['prepared_us']:7.1f}x {r['load_ms']:8.1f} {r['prepare_ms']:10.1f}")
+    raw_us = sum(r["raw_us"] for _, _, r in rows) / len(rows)
+    prepared_us = sum(r["prepared_us"] for _, _, r in rows) / len(rows)
+    prepare_ms = sum(r["prepare_ms"] for _, _, r in rows)
+    print(f"mean blit {raw_us:.2f} us -> {prepared_us:.2f} us ({raw_us / prepared_us:.1f}x), "
+          f"preparing every strip adds {prepare_ms:.0f} ms of load time")
+
+    if not args.no_history:
+        append_history(args.history, [{
+            "scenario": "blit",
+            "phases": {f"{unit}/{state}": {"mean_ms": r["prepared_us"] / 1000, "raw_ms": r["raw_us"] / 1000,
+                                           "fill_saved": round(r["fill_saved"], 3)} for unit, state, r in rows},
+            "failures": [],
+        }])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
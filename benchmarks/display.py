@@ -0,0 +1,63 @@
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.startup import child_env
+
+# (render scale, window size or None) pairs covering a shrunk target, a larger window, and both
+CONFIGS = [(1.0, None), (0.5, None), (1.0, (1600, 800)), (0.5, (1200, 600))]
+
+def play(render_scale, window, frames):
+    # runs in the child: click PLAY in window pixels, then let the greedy policy play for a while
+    os.chdir(ROOT)
+    import pygame
+    from core.screen import ScreenManager
+    from core.policy import GreedyPolicy
+    from benchmarks.run import load_game_module
+    ScreenManager.RENDER_SCALE = render_scale
+    ScreenManager.WINDOW_SIZE = window
+    game_module = load_game_module()
+    game_module.GameManager.CHECKPOINT_PATH = os.path.join(tempfile.mkdtemp(), "checkpoint.bin")
+    screen_mgr = ScreenManager()
+    window_w, window_h = screen_mgr.display.get_size()
+    play_x, play_y = ScreenManager.WIDTH // 2, ScreenManager.HEIGHT // 2 + 127
+    pos = (play_x * window_w // ScreenManager.WIDTH, play_y * window_h // ScreenManager.HEIGHT)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+    game_module.main(GreedyPolicy(), memprofile=True, max_frames=frames)
+
+def smoke(frames):
+    failures = 0
+    for render_scale, window in CONFIGS:
+        args = [sys.executable, __file__, "--child", "--render-scale", str(render_scale), "--frames", str(frames)]
+        if window:
+            args += ["--window", *map(str, window)]
+        run = subprocess.run(args, env=child_env(), capture_output=True, text=True, cwd=ROOT)
+        started = "[mem] start" in run.stdout
+        ok = run.returncode == 0 and started
+        failures += not ok
+        label = "x".join(map(str, window)) if window else "target"
+        print(f"render scale {render_scale:<4} window {label:<10}  rc {run.returncode:<4} "
+              f"{'battle started' if started else 'no battle'}  {'ok' if ok else 'FAILED'}")
+        if not ok:
+            print(run.stderr[-2000:])
+    return 1 if failures else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Start a battle under each render scale / window size combination")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--render-scale", type=float, default=1.0, help=argparse.SUPPRESS)
+    parser.add_argument("--window", type=int, nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        play(args.render_scale, tuple(args.window) if args.window else None, args.frames)
+        return 0
+    return smoke(args.frames)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tracemalloc
+import importlib.util
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from core.screen import ScreenManager
+from units.hero import Archer, Warrior, Mage, Healer
+from units.enemy import Enemy
+
+FRAME_BUDGET_MS = 1000 / ScreenManager.FPS
+# scenarios too heavy for 60 fps have no fixed budget: they are gated at the median of this machine's last
+# BASELINE_RUNS recorded means times HEADROOM, and only warn until such a baseline exists
+HEADROOM = 1.5
+BASELINE_RUNS = 5
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "history.jsonl")
+ALLOC_FRAMES = 10
+
+def load_game_module():
+    spec = importlib.util.spec_from_file_location("heros_go", os.path.join(ROOT, "heros go!.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def populate(game, count, hero_classes=(Archer, Warrior, Mage, Healer)):
+    rng = random.Random(count)
+    for i in range(count // 2):
+        hero = game.create_hero(hero_classes[i % len(hero_classes)])
+        hero.x = rng.uniform(60, game.world_width // 2)
+        game.heroes.append(hero)
+    enemy_types = list(game.enemy_sprites)
+    for i in range(count - count // 2):
+        enemy = Enemy(game.enemy_sprites[enemy_types[i % len(enemy_types)]])
+        enemy.x = rng.uniform(game.world_width // 2, game.world_width - 60)
+        game.enemies.append(enemy)
+    game.player_base.health = 10 ** 9
+    game.enemy_base_target.health = game.enemy_base.health = 10 ** 9
+
+class BenchmarkRunner:
+    def __init__(self, game_module, trace_alloc=True):
+        self.game_module = game_module
+        self.trace_alloc = trace_alloc
+        self.timings = defaultdict(list)
+        self.alloc = {"net_kib_per_frame": 0.0, "peak_kib": 0.0}
+
+    def new_game(self, stage=1, world_width=None):
+        start = time.perf_counter()
+        game = self.game_module.GameManager(world_width=world_width)
+        game.stage = stage
+        self.timings["setup"].append(time.perf_counter() - start)
+        return game
+
+    def frame(self, game, spawn=False, pan=0):
+        if pan:
+            game.camera.scroll(pan)
+        t0 = time.perf_counter()
+        if spawn:
+            game.spawn_enemy()
+        t1 = time.perf_counter()
+        game.update()
+        t2 = time.perf_counter()
+        game.draw()
+        t3 = time.perf_counter()
+        return t1 - t0, t2 - t1, t3 - t2
+
+    def run_frames(self, game, frames, spawn=False, pan=0):
+        for _ in range(frames):
+            spawn_t, update_t, draw_t = self.frame(game, spawn, pan)
+            self.timings["spawn"].append(spawn_t)
+            self.timings["update"].append(update_t)
+            self.timings["draw"].append(draw_t)
+            self.timings["frame"].append(spawn_t + update_t + draw_t)
+
+        if self.trace_alloc:
+            traced = min(ALLOC_FRAMES, frames)
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(traced):
+                self.frame(game, spawn, pan)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.alloc["net_kib_per_frame"] = max(self.alloc["net_kib_per_frame"], (current - before) / 1024 / max(traced, 1))
+            self.alloc["peak_kib"] = max(self.alloc["peak_kib"], peak / 1024)
+
+    def summary(self):
+        phases = {}
+        for phase, samples in self.timings.items():
+            ordered = sorted(samples)
+            phases[phase] = {
+                "mean_ms": 1000 * sum(ordered) / len(ordered),
+                "p95_ms": 1000 * ordered[int(0.95 * (len(ordered) - 1))],
+                "max_ms": 1000 * ordered[-1],
+                "samples": len(ordered),
+            }
+        return phases
+
+def empty_lane(runner, frames):
+    game = runner.new_game()
+    runner.run_frames(game, frames)
+
+def crowd(count):
+    def scenario(runner, frames):
+        game = runner.new_game()
+        populate(game, count)
+        runner.run_frames(game, frames)
+    return scenario
+
+def projectile_storm(runner, frames):
+    game = runner.new_game()
+    populate(game, 40, hero_classes=(Mage,))
+    for hero in game.heroes:
+        hero.skill.skill_cooldown = 0.25
+        hero.skill.skill_chance = 1.0
+    runner.run_frames(game, frames)
+
+def stage_transitions(runner, frames):
+    for stage in range(1, 6):
+        game = runner.new_game(stage)
+        populate(game, 50)
+        runner.run_frames(game, max(frames // 5, 1), spawn=True)
+
+def wide_lane(runner, frames):
+    game = runner.new_game(world_width=20 * ScreenManager.WIDTH)
+    populate(game, 500)
+    runner.run_frames(game, frames, pan=(game.world_width - ScreenManager.WIDTH) // frames)
+
+def restart_loop(runner, frames):
+    for _ in range(20):
+        game = runner.new_game()
+        runner.run_frames(game, max(frames // 20, 1), spawn=True)
+
+# name: (scenario, frames, {phase: mean budget in ms, or None to gate against the machine's baseline})
+SCENARIOS = {
+    "empty_lane": (empty_lane, 300, {"frame": FRAME_BUDGET_MS}),
+    "units_50": (crowd(50), 300, {"frame": FRAME_BUDGET_MS}),
+    "units_500": (crowd(500), 60, {"frame": None}),
+    "units_5000": (crowd(5000), 2, {"frame": None}),
+    "projectile_storm": (projectile_storm, 120, {"frame": 4 * FRAME_BUDGET_MS}),
+    "wide_lane": (wide_lane, 120, {"frame": None, "draw": FRAME_BUDGET_MS}),
+    "stage_transitions": (stage_transitions, 300, {"frame": FRAME_BUDGET_MS, "setup": 1000}),
+    "restart_loop": (restart_loop, 100, {"frame": FRAME_BUDGET_MS, "setup": 1000}),
+}
+SLOW_SCENARIOS = {"units_5000"}
+
+def machine_key():
+    # timings are only comparable between runs on the same host, interpreter and render scale
+    return {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "render_scale": ScreenManager.RENDER_SCALE,
+    }
+
+def load_baselines(path, runs=BASELINE_RUNS):
+    key = machine_key()
+    samples = defaultdict(list)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if any(entry.get(k) != v for k, v in key.items()):
+                continue
+            for result in entry["results"]:
+                for phase, stats in result["phases"].items():
+                    samples[result["scenario"], phase].append(stats["mean_ms"])
+    return {k: statistics.median(v[-runs:]) for k, v in samples.items()}
+
+def run_scenario(game_module, name, budget_scale=1.0, trace_alloc=True, baselines=None):
+    scenario, frames, budgets = SCENARIOS[name]
+    random.seed(name)
+    runner = BenchmarkRunner(game_module, trace_alloc)
+    scenario(runner, frames)
+    phases = runner.summary()
+    failures = []
+    warnings = []
+    for phase, budget in budgets.items():
+        if phase not in phases:
+            continue
+        mean = phases[phase]["mean_ms"]
+        if budget is None:
+            baseline = (baselines or {}).get((name, phase))
+            if baseline is None:
+                warnings.append(f"{phase} mean {mean:.2f} ms not gated: no baseline recorded on this machine yet")
+                continue
+            limit = baseline * HEADROOM * budget_scale
+            if mean > limit:
+                failures.append(f"{phase} mean {mean:.2f} ms > {limit:.2f} ms (baseline {baseline:.2f} ms x {HEADROOM})")
+        elif mean > budget * budget_scale:
+            failures.append(f"{phase} mean {mean:.2f} ms > budget {budget * budget_scale:.2f} ms")
+    return {"scenario": name, "phases": phases, "alloc": runner.alloc, "failures": failures, "warnings": warnings}
+
+def append_history(path, results):
+    entry = {"timestamp": time.time(), **machine_key(), "results": results}
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def print_result(result):
+    status = "FAIL" if result["failures"] else "ok"
+    print(f"{result['scenario']:<18} {status}")
+    for phase, stats in result["phases"].items():
+        print(f"  {phase:<7} mean {stats['mean_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  max {stats['max_ms']:8.2f} ms")
+    if result["alloc"]["peak_kib"]:
+        print(f"  alloc   net {result['alloc']['net_kib_per_frame']:.1f} KiB/frame  peak {result['alloc']['peak_kib']:.1f} KiB")
+    for warning in result["warnings"]:
+        print(f"  ?? {warning}")
+    for failure in result["failures"]:
+        print(f"  !! {failure}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless frame-budget benchmarks for Battle Heroes Defense")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all except {', '.join(sorted(SLOW_SCENARIOS))})")
+    parser.add_argument("--all", action="store_true", help="also run slow scenarios")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every budget, e.g. 2 on slow machines")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON lines file results are appended to and baselines read from")
+    parser.add_argument("--baseline-runs", type=int, default=BASELINE_RUNS, help="recent runs on this machine the baseline is the median of")
+    parser.add_argument("--no-history", action="store_true", help="do not record results")
+    parser.add_argument("--combat-log", type=float, default=0.0, metavar="RATE", help="run with the combat log keeping RATE of events")
+    parser.add_argument("--no-alloc", action="store_true", help="skip tracemalloc allocation pass")
+    parser.add_argument("--render-scale", type=float, default=1.0, help="draw into a render target this fraction of 800x400")
+    args = parser.parse_args(argv)
+    ScreenManager.RENDER_SCALE = args.render_scale
+    # time drawing into the target only; benchmarks/display.py covers presenting it in another window size
+    ScreenManager.WINDOW_SIZE = ScreenManager.target_size()
+
+    names = args.scenarios or [n for n in SCENARIOS if args.all or n not in SLOW_SCENARIOS]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    game_module = load_game_module()
+    game_module.Tracker.COMBAT_LOG = args.combat_log
+    baselines = load_baselines(args.history, args.baseline_runs)
+    results = []
+    for name in names:
+        result = run_scenario(game_module, name, args.budget_scale, not args.no_alloc, baselines)
+        print_result(result)
+        results.append(result)
+
+    if not args.no_history:
+        append_history(args.history, results)
+    return 1 if any(r["failures"] for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
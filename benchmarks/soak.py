@@ -0,0 +1,62 @@
+import os
+import sys
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from core.clock import clock
+from core.memprof import MemoryProfiler
+from core.policy import GreedyPolicy
+from core.screen import ScreenManager
+from benchmarks.run import load_game_module
+
+def soak(game_module, restarts, ticks, report_every, max_growth_kib):
+    profiler = MemoryProfiler()
+    policy = GreedyPolicy()
+    game = None
+    first = last = None
+    clock.use_simulated()
+    try:
+        for i in range(restarts):
+            stage = 1 + i % 5
+            if game is not None:
+                profiler.expect_game_freed(game)
+            game = game_module.GameManager()
+            game.stage = stage
+            for _ in range(ticks):
+                game.step_policy(policy)
+                game.spawn_enemy()
+                game.update()
+                game.draw()
+                clock.advance(1 / ScreenManager.FPS)
+            game.tracker.snapshot_data.clear()
+
+            if i == 0 or (i + 1) % report_every == 0 or i + 1 == restarts:
+                report = profiler.checkpoint(f"restart {i + 1} (stage {stage})", game)
+                print(profiler.format(report))
+                first = first or report
+                last = report
+    finally:
+        clock.use_wall()
+        profiler.stop()
+
+    growth = (last["traced_bytes"] - first["traced_bytes"]) / 1024
+    flagged = any(r["flags"] for r in profiler.reports)
+    print(f"retained growth over {restarts} restarts: {growth:+.0f} KiB")
+    return 1 if flagged or growth > max_growth_kib else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless restart/stage-transition memory soak test")
+    parser.add_argument("--restarts", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=30, help="simulated ticks per battle")
+    parser.add_argument("--report-every", type=int, default=25)
+    parser.add_argument("--max-growth-kib", type=float, default=1024, help="fail if retained memory grows more than this")
+    args = parser.parse_args(argv)
+    return soak(load_game_module(), args.restarts, args.ticks, args.report_every, args.max_growth_kib)
+
+if __name__ == "__main__":
+    sys.exit(main())
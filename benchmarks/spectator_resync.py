@@ -0,0 +1,78 @@
+import os
+import sys
+import socket
+import argparse
+import selectors
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.broadcast import (
+    KEY, DELTA, LENGTH, FRAME, NAME, PROJECTILE, StateBroadcaster, StateDecoder, _Client, read_frames,
+)
+
+def make_frame(kind, seq, projectiles):
+    parts = [FRAME.pack(kind, seq, seq, 1, 800, 0, 0, 0, 0, 0, 0, projectiles)]
+    if kind == KEY:
+        parts.append(NAME.pack(0))
+    parts.append(PROJECTILE.pack(seq, 0) * projectiles)
+    payload = b"".join(parts)
+    return LENGTH.pack(len(payload)) + payload
+
+def resync(frames, projectiles, buffer_kib):
+    # a spectator that stops reading mid-frame, overflows its buffer, then must decode the next keyframe
+    broadcaster = StateBroadcaster()
+    broadcaster.CLIENT_BUFFER = buffer_kib << 10
+    broadcaster.selector = selectors.DefaultSelector()
+    server_end, spectator = socket.socketpair()
+    server_end.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    spectator.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    server_end.setblocking(False)
+    spectator.setblocking(False)
+    client = _Client(server_end)
+    broadcaster.clients.append(client)
+    broadcaster.selector.register(server_end, selectors.EVENT_READ, client)
+
+    seq = 0
+    for _ in range(frames):
+        seq += 1
+        broadcaster.frames.append(make_frame(KEY if seq == 1 or broadcaster.want_keyframe else DELTA, seq, projectiles))
+        broadcaster.distribute()
+    overflowed = broadcaster.want_keyframe
+    seq += 1
+    last_key = seq
+    broadcaster.frames.append(make_frame(KEY, seq, projectiles))
+    broadcaster.distribute()
+
+    decoder = StateDecoder()
+    buffer = bytearray()
+    decoded = 0
+    try:
+        while True:
+            received, _ = read_frames(spectator, buffer)
+            for payload in received:
+                decoder.apply(payload)
+                decoded += 1
+            if client.pending:
+                broadcaster.flush(client)
+            elif not received:
+                break
+    finally:
+        spectator.close()
+        server_end.close()
+        broadcaster.selector.close()
+    ok = overflowed and decoder.synced and decoder.seq == last_key and not buffer
+    print(f"overflowed {overflowed}  decoded {decoded} frames  last seq {decoder.seq} (keyframe {last_key})  "
+          f"{'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that a spectator dropped mid-frame resyncs on the next keyframe")
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument("--projectiles", type=int, default=2000, help="per frame, sets the frame size")
+    parser.add_argument("--buffer-kib", type=int, default=64, help="per-client backlog limit")
+    args = parser.parse_args(argv)
+    return resync(args.frames, args.projectiles, args.buffer_kib)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.run import HISTORY_PATH, append_history
+
+ENTRY = os.path.join(ROOT, "heros go!.py")
+TARGET_MS = 1000
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def child_env():
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    return env
+
+def time_to_first_frame(python=sys.executable):
+    # wall time from spawning the interpreter until the game exits after drawing its first menu frame
+    start = time.perf_counter()
+    subprocess.run([python, ENTRY, "--max-frames", "1"], cwd=ROOT, env=child_env(), check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def import_times(python=sys.executable):
+    proc = subprocess.run([python, "-X", "importtime", ENTRY, "--max-frames", "1"], cwd=ROOT, env=child_env(),
+                          check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, (len(indent) - 1) // 2, int(self_us), int(cumulative_us)))
+    return rows
+
+def import_report(rows, top=15):
+    # top-level imports are the ones the entry point (or an import it triggers first) asked for
+    roots = sorted((r for r in rows if r[1] == 0), key=lambda r: -r[3])
+    total = sum(r[3] for r in roots)
+    lines = [f"imports {total / 1000:.0f} ms"]
+    for name, _, _, cumulative in roots[:top]:
+        lines.append(f"  {name:<40} {cumulative / 1000:8.1f} ms")
+    return lines
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark: time from launch to the first main menu frame")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS)
+    parser.add_argument("--imports", type=int, default=15, metavar="N", help="show the N slowest top-level imports (0 to skip)")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON lines file results are appended to")
+    parser.add_argument("--no-history", action="store_true", help="do not record results")
+    args = parser.parse_args(argv)
+
+    time_to_first_frame()  # warm the OS file cache and bytecode caches
+    samples = sorted(time_to_first_frame() for _ in range(args.runs))
+    median_ms = 1000 * samples[len(samples) // 2]
+    failures = [f"first frame median {median_ms:.0f} ms > target {args.target_ms:.0f} ms"] if median_ms > args.target_ms else []
+    print(f"startup            {'FAIL' if failures else 'ok'}")
+    print(f"  first frame  median {median_ms:8.1f} ms  min {1000 * samples[0]:8.1f} ms  max {1000 * samples[-1]:8.1f} ms")
+    for failure in failures:
+        print(f"  !! {failure}")
+    if args.imports:
+        print("\n".join(import_report(import_times(), args.imports)))
+
+    if not args.no_history:
+        append_history(args.history, [{
+            "scenario": "startup",
+            "phases": {"first_frame": {"mean_ms": median_ms, "p95_ms": 1000 * samples[-1], "max_ms": 1000 * samples[-1],
+                                       "samples": len(samples)}},
+            "failures": failures,
+        }])
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-import time
+from core.clock import clock
 
 class Character:
     def __init__(self, x, y, health, speed):
@@ -11,6 +11,10 @@ class Character:
         if self.alive:
             self.x += self.speed
 
+    def die(self):
+        self.alive = False
+        self.is_dying = True
+
 class Attack:
     def __init__(self, dmg, cooldown):
         self.dmg = dmg
@@ -18,15 +22,9 @@ class Attack:
         self.last_time = 0
 
     def can_attack(self):
-        return time.time() - self.last_time >= self.cooldown
+        return clock.now() - self.last_time >= self.cooldown
 
-    def attack_target(self, target):
+    def attack_target(self, target, source, resolver):
         if self.can_attack():
-            if hasattr(target, 'take_damage'):
-                target.take_damage(self.dmg)
-            else:
-                target.health -= self.dmg
-                if target.health <= 0:
-                    target.alive = False
-                    target.is_dying = True
-            self.last_time = time.time()
\ No newline at end of file
+            resolver.damage(source, target, self.dmg)
+            self.last_time = clock.now()
\ No newline at end of file
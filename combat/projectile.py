@@ -1,5 +1,5 @@
 class Projectile:
-    def __init__(self, x, y, target_x, target_y, speed, image, damage, on_hit_callback=None, max_range=300):
+    def __init__(self, x, y, target_x, target_y, speed, image, damage, on_hit_callback=None, max_range=300, owner=None, target=None):
         self.x = x
         self.y = y
         self.start_x = x
@@ -8,9 +8,13 @@ class Projectile:
         self.target_y = target_y
         self.speed = speed
         self.image = image
+        self.half_width = image.get_width() // 2
+        self.half_height = image.get_height() // 2
         self.damage = damage
         self.on_hit_callback = on_hit_callback
         self.max_range = max_range
+        self.owner = owner
+        self.target = target
         self.alive = True
 
         dx = target_x - x
@@ -38,5 +42,5 @@ class Projectile:
     def has_reached_target(self):
         return (abs(self.x - self.target_x) < 5) and (abs(self.y - self.target_y) < 5)
 
-    def draw(self, surface):
-        surface.blit(self.image, (self.x - self.image.get_width() // 2, self.y - self.image.get_height() // 2))
\ No newline at end of file
+    def draw_rect(self):
+        return self.image.get_rect(center=(self.x, self.y))
\ No newline at end of file
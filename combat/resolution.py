@@ -0,0 +1,72 @@
+from core.events import events, Damage, Heal, unit_name
+
+class CombatResolver:
+    def __init__(self):
+        self.targets = []
+        self.sources = []
+        self.amounts = []
+        self.resolved = 0
+
+    def damage(self, source, target, amount):
+        self.targets.append(target)
+        self.sources.append(source)
+        self.amounts.append(amount)
+
+    def heal(self, source, target, amount):
+        self.targets.append(target)
+        self.sources.append(source)
+        self.amounts.append(-amount)
+
+    def totals(self, index, amounts, n):
+        damage = [0] * n
+        heal = [0] * n
+        for slot, amount in zip(index, amounts):
+            if amount >= 0:
+                damage[slot] += amount
+            else:
+                heal[slot] -= amount
+        return damage, heal
+
+    def emit_events(self, units, index, sources, amounts, room):
+        room = list(room)
+        for slot, source, amount in zip(index, sources, amounts):
+            target = units[slot]
+            if not target.alive:
+                continue
+            if amount >= 0:
+                events.emit(Damage, unit_name(source), unit_name(target), amount)
+            else:
+                healed = min(-amount, room[slot])
+                if healed > 0:
+                    room[slot] -= healed
+                    events.emit(Heal, unit_name(source), unit_name(target), healed)
+
+    def resolve(self):
+        targets, sources, amounts = self.targets, self.sources, self.amounts
+        if not targets:
+            return
+        self.targets, self.sources, self.amounts = [], [], []
+        self.resolved += len(targets)
+
+        slots = {}
+        units = []
+        index = []
+        for t in targets:
+            slot = slots.get(id(t))
+            if slot is None:
+                slot = slots[id(t)] = len(units)
+                units.append(t)
+            index.append(slot)
+
+        room = [max(u.max_health - u.health, 0) for u in units]
+        if events.active and (events.wants(Damage) or events.wants(Heal)):
+            self.emit_events(units, index, sources, amounts, room)
+
+        # heals land before damage so a unit healed and hit in the same tick sees both
+        damage, heal = self.totals(index, amounts, len(units))
+        for unit, dmg, healed, space in zip(units, damage, heal, room):
+            if not unit.alive:
+                continue
+            unit.health = unit.health + min(healed, space) - dmg
+            if unit.health <= 0:
+                unit.die()
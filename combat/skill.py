@@ -1,8 +1,8 @@
-import time
+from core.clock import clock
 import random
 
 class SkillEffect:
-    def apply(self, user, targets):
+    def apply(self, user, targets, resolver):
         pass
 
 class AreaDamageEffect(SkillEffect):
@@ -10,35 +10,31 @@ class AreaDamageEffect(SkillEffect):
         self.radius = radius
         self.damage = damage
 
-    def apply(self, user, targets):
+    def apply(self, user, targets, resolver):
         for t in targets:
             if abs(user.x - t.x) <= self.radius and t.alive:
-                t.health -= self.damage
-                if t.health <= 0:
-                    t.alive = False
+                resolver.damage(user, t, self.damage)
 
 class BuffAttackSpeedEffect(SkillEffect):
     def __init__(self, buff_amount=0.5, duration=5):
         self.buff_amount = buff_amount
         self.duration = duration
 
-    def apply(self, user, targets):
+    def apply(self, user, targets, resolver):
         for ally in targets:
             if not hasattr(ally, "original_cooldown"):
                 ally.original_cooldown = ally.attack.cooldown
             ally.attack.cooldown = max(0.1, ally.attack.cooldown - self.buff_amount)
-            ally.buff_end_time = time.time() + self.duration
+            ally.buff_end_time = clock.now() + self.duration
 
 class GroupHealEffect(SkillEffect):
     def __init__(self, heal_amount=15):
         self.heal_amount = heal_amount
 
-    def apply(self, user, targets):
+    def apply(self, user, targets, resolver):
         for t in targets:
             if t.alive and t.health < t.max_health:
-                t.health += self.heal_amount
-                if t.health > t.max_health:
-                    t.health = t.max_health
+                resolver.heal(user, t, self.heal_amount)
 
 class Skill:
     def __init__(self, name, skill_cooldown, effect: SkillEffect, skill_chance=1.0, cast_duration=0.3):
@@ -50,11 +46,11 @@ class Skill:
         self.last_used_time = 0
 
     def can_use_skill(self):
-        cooldown_ready = time.time() - self.last_used_time >= self.skill_cooldown
+        cooldown_ready = clock.now() - self.last_used_time >= self.skill_cooldown
         chance_roll = random.random() < self.skill_chance
         return cooldown_ready and chance_roll
 
-    def use(self, user, targets):
+    def use(self, user, targets, resolver):
         if self.can_use_skill():
-            self.effect.apply(user, targets)
-            self.last_used_time = time.time()
+            self.effect.apply(user, targets, resolver)
+            self.last_used_time = clock.now()
@@ -1,20 +1,34 @@
 import pygame
 import os
+import sys
+import json
 import time
+import struct
+import argparse
+from collections import OrderedDict
+from collections.abc import Mapping
+from weakref import WeakSet
+from core.clock import clock
+
+MANIFEST = "assets/animations.json"
+PNG_SIZE = struct.Struct(">II")
 
 class Animation:
-    def __init__(self, frames, interval=0.1, loop=True):
-        self.frames = frames
+    def __init__(self, frames, interval=0.1, loop=True, state=None):
+        # with a state, frames is a mapping of strips (an AnimationSet) looked up on first use
+        self.source = frames if state is not None else None
+        self.state = state
+        self.strip = frames if state is None else None
         self.interval = interval
         self.index = 0
-        self.last_time = time.time()
+        self.last_time = clock.now()
         self.loop = loop
         self.finished = False
 
     def update(self):
         if self.finished:
             return
-        if time.time() - self.last_time >= self.interval:
+        if clock.now() - self.last_time >= self.interval:
             self.index += 1
             if self.index >= len(self.frames):
                 if self.loop:
@@ -22,12 +36,40 @@ class Animation:
                 else:
                     self.index = len(self.frames) - 1
                     self.finished = True
-            self.last_time = time.time()
+            self.last_time = clock.now()
+
+    @property
+    def frames(self):
+        if self.strip is None:
+            # register before the lookup so loading this strip can't evict it
+            self.source.use(self.state, self)
+            self.strip = self.source[self.state]
+        return self.strip
 
     def get_frame(self):
         return self.frames[self.index]
 
+class SpriteFrame(pygame.Surface):
+    # a copy of one strip cell trimmed to its visible pixels; blit at (x + dx, y + dy) where x is the
+    # centre and y the top of the untrimmed cell, so placement matches drawing the full cell
+    def __init__(self, cell, colorkey=None):
+        rect = cell.get_bounding_rect()
+        if colorkey is None:
+            super().__init__(rect.size, pygame.SRCALPHA, cell)
+            # no RLE here: SDL's RLE alpha blitter rounds partial alpha differently from the plain one
+            self.blit(cell, (0, 0), rect, special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            super().__init__(rect.size, 0, pygame.display.get_surface())
+            self.fill(colorkey)
+            self.blit(cell, (0, 0), rect)
+            self.set_colorkey(colorkey, pygame.RLEACCEL)
+        self.cell_size = cell.get_size()
+        self.dx = rect.x - cell.get_width() // 2
+        self.dy = rect.y
+
 class AnimationManager:
+    COLORKEYS = ((255, 0, 255), (0, 255, 255), (1, 254, 2))
+
     @staticmethod
     def load_sprite_strip(path):
         sheet = pygame.image.load(path).convert_alpha()
@@ -36,6 +78,26 @@ class AnimationManager:
         cols = sheet.get_width() // frame_width
         return [sheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, frame_height)) for i in range(cols)]
 
+    @staticmethod
+    def colorkey_for(frames, masks):
+        for key in AnimationManager.COLORKEYS:
+            if not any(pygame.mask.from_threshold(f, key, (1, 1, 1, 255)).overlap_area(m, (0, 0)) for f, m in zip(frames, masks)):
+                return key
+        return None
+
+    @staticmethod
+    def prepare_strip(frames):
+        # strips whose alpha is all-or-nothing become colorkeyed RLE copies (cheapest to blit);
+        # any partial alpha keeps per-pixel alpha, which trimming alone already makes several times cheaper
+        opaque = [pygame.mask.from_surface(f, 254) for f in frames]
+        binary = all(m.count() == pygame.mask.from_surface(f, 0).count() for f, m in zip(frames, opaque))
+        key = AnimationManager.colorkey_for(frames, opaque) if binary else None
+        return [SpriteFrame(f, key) for f in frames]
+
+    @staticmethod
+    def load_prepared_strip(path):
+        return AnimationManager.prepare_strip(AnimationManager.load_sprite_strip(path))
+
     @staticmethod
     def load_animations_from_folder(folder):
         animations = {}
@@ -44,3 +106,164 @@ class AnimationManager:
                 key = file.replace(".png", "").lower()
                 animations[key] = AnimationManager.load_sprite_strip(os.path.join(folder, file))
         return animations
+
+
+def png_bytes(path):
+    with open(path, "rb") as f:
+        header = f.read(24)
+    width, height = PNG_SIZE.unpack_from(header, 16)
+    return width * height * 4
+
+def strip_bytes(frames):
+    surfaces = {id(s): s for s in (f.get_abs_parent() for f in frames)}
+    return sum(s.get_pitch() * s.get_height() for s in surfaces.values())
+
+class AnimationSet(Mapping):
+    def __init__(self, unit_type, folder, states, budget):
+        self.unit_type = unit_type
+        self.folder = folder
+        self.states = states
+        self.budget = budget
+        self.loaded = {}
+        self.users = {}
+
+    def path(self, state):
+        return os.path.join(self.folder, self.states[state] + ".png")
+
+    def __getitem__(self, state):
+        frames = self.loaded.get(state)
+        if frames is None:
+            if state not in self.states:
+                raise KeyError(state)
+            frames = self.loaded[state] = self.budget.load(self, state)
+        else:
+            self.budget.touch(self.unit_type, state)
+        return frames
+
+    def __contains__(self, state):
+        return state in self.states
+
+    def __iter__(self):
+        return iter(self.states)
+
+    def __len__(self):
+        return len(self.states)
+
+    def unload(self, state):
+        self.loaded.pop(state, None)
+
+    def use(self, state, animation):
+        self.users.setdefault(state, WeakSet()).add(animation)
+
+    def in_use(self, state):
+        # a state stays in use until every Animation that resolved its strip has been freed
+        return bool(self.users.get(state))
+
+    def preload(self):
+        for state in self.states:
+            self[state]
+
+class TextureBudget:
+    LIMIT = 32 << 20
+
+    def __init__(self, limit=None):
+        self.limit = limit or self.LIMIT
+        self.resident = OrderedDict()
+        self.pinned = {}
+        self.load_ms = {}
+        self.sets = {}
+        self.bytes = 0
+        self.loads = 0
+        self.evicted = 0
+
+    def animation_sets(self, path=MANIFEST):
+        sets = self.sets.get(path)
+        if sets is None:
+            with open(path) as f:
+                manifest = json.load(f)
+            sets = self.sets[path] = {name: AnimationSet(name, spec["folder"], spec["states"], self)
+                                      for name, spec in manifest.items()}
+        return sets
+
+    def load(self, anim_set, state):
+        start = time.perf_counter()
+        frames = AnimationManager.load_prepared_strip(anim_set.path(state))
+        name = anim_set.unit_type
+        self.load_ms[name] = self.load_ms.get(name, 0) + 1000 * (time.perf_counter() - start)
+        size = strip_bytes(frames)
+        self.resident[(name, state)] = (anim_set, size)
+        self.bytes += size
+        self.loads += 1
+        self.evict()
+        return frames
+
+    def touch(self, unit_type, state):
+        self.resident.move_to_end((unit_type, state))
+
+    def pin(self, unit_type, size, elapsed=0):
+        # textures owned elsewhere (enemy variants) count against the budget but are never evicted
+        self.bytes += size - self.pinned.get(unit_type, 0)
+        self.pinned[unit_type] = size
+        self.load_ms[unit_type] = 1000 * elapsed
+
+    def evict(self):
+        # least recently requested states go first; the one just requested and any strip a live unit still
+        # draws can't be freed, so they stay resident
+        for (name, state), (anim_set, size) in list(self.resident.items())[:-1]:
+            if self.bytes <= self.limit:
+                break
+            if anim_set.in_use(state):
+                continue
+            del self.resident[(name, state)]
+            anim_set.unload(state)
+            self.bytes -= size
+            self.evicted += 1
+
+    def report(self):
+        rows = {}
+        for (name, state), (anim_set, size) in self.resident.items():
+            row = rows.setdefault(name, {"states": [], "bytes": 0, "declared": len(anim_set)})
+            row["states"].append(state)
+            row["bytes"] += size
+        for name, size in self.pinned.items():
+            rows[name] = {"states": ["*"], "bytes": size, "declared": None}
+        for name, row in rows.items():
+            row["load_ms"] = round(self.load_ms.get(name, 0), 2)
+        return {"units": rows, "bytes": self.bytes, "limit": self.limit, "loads": self.loads, "evicted": self.evicted}
+
+textures = TextureBudget()
+
+def format_report(report):
+    lines = [f"{'unit':<14}{'states':<28}{'KiB':>8}{'load ms':>9}"]
+    for name, row in report["units"].items():
+        states = ",".join(row["states"])
+        if row["declared"] is not None:
+            states = f"{len(row['states'])}/{row['declared']} {states}"
+        lines.append(f"{name:<14}{states:<28}{row['bytes'] / 1024:8.0f}{row['load_ms']:9.1f}")
+    lines.append(f"resident {report['bytes'] / 1024:.0f} KiB of {report['limit'] / 1024:.0f} KiB budget, "
+                 f"{report['loads']} strips loaded, {report['evicted']} evicted")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load every animation the game draws and report texture memory per unit type")
+    parser.add_argument("manifest", nargs="?", default=MANIFEST)
+    parser.add_argument("--budget", type=float, help="texture budget in MiB")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    from core.variants import build_variants, read_manifest, register_variants
+    budget = TextureBudget(args.budget and int(args.budget * (1 << 20)))
+    sets = budget.animation_sets(args.manifest)
+    for anim_set in sets.values():
+        anim_set.preload()
+    start = time.perf_counter()
+    register_variants(build_variants(read_manifest()), budget, time.perf_counter() - start)
+    print(format_report(budget.report()))
+    folders = {anim_set.folder for anim_set in sets.values()}
+    legacy = sum(png_bytes(os.path.join(folder, f)) for folder in folders for f in os.listdir(folder) if f.endswith(".png"))
+    print(f"decoding every strip in the hero folders: {legacy / 1024:.0f} KiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
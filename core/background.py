@@ -0,0 +1,95 @@
+from collections import OrderedDict
+import pygame
+from core.screen import ScreenManager
+
+class ChunkedBackground:
+    CHUNK_WIDTH = 400
+    PREFETCH = 1
+    BUILDS_PER_FRAME = 1
+
+    def __init__(self, image_path, world_width, crop_bottom=50, chunk_width=None, capacity=None):
+        self.image_path = image_path
+        self.world_width = world_width
+        self.crop_bottom = crop_bottom
+        self.chunk_width = chunk_width or self.CHUNK_WIDTH
+        self.height = ScreenManager.px(ScreenManager.HEIGHT)
+        self.chunk_count = -(-world_width // self.chunk_width)
+        self.capacity = capacity or ScreenManager.WIDTH // self.chunk_width + 2 + 2 * self.PREFETCH
+        self.chunks = OrderedDict()
+        self.tiles = None
+        self.last_x = 0
+        self.built = 0
+        self.evicted = 0
+
+    def load_tiles(self):
+        bg = pygame.image.load(self.image_path).convert()
+        cropped = bg.subsurface(pygame.Rect(0, 0, bg.get_width(), bg.get_height() - self.crop_bottom))
+        tile = pygame.transform.scale(cropped, ScreenManager.target_size())
+        # the mirrored tile only exists once a chunk actually reaches the second tile
+        self.tiles = [tile, None]
+
+    def tile(self, t):
+        tile = self.tiles[t % 2]
+        if tile is None:
+            tile = self.tiles[1] = pygame.transform.flip(self.tiles[0], True, False)
+        return tile
+
+    def columns(self, i):
+        # chunk i's pixel columns on the render target; rounding world edges keeps neighbouring chunks flush
+        x0 = i * self.chunk_width
+        return ScreenManager.px(x0), ScreenManager.px(min(x0 + self.chunk_width, self.world_width))
+
+    def build_chunk(self, i):
+        if self.tiles is None:
+            self.load_tiles()
+        tile_width = self.tiles[0].get_width()
+        p0, p1 = self.columns(i)
+        chunk = pygame.Surface((p1 - p0, self.height)).convert()
+        pos = p0
+        while pos < p1:
+            # mirror every other tile so neighbouring tiles meet without a seam
+            t, offset = divmod(pos, tile_width)
+            span = min(tile_width - offset, p1 - pos)
+            chunk.blit(self.tile(t), (pos - p0, 0), pygame.Rect(offset, 0, span, self.height))
+            pos += span
+        self.built += 1
+        return chunk
+
+    def chunk(self, i):
+        chunk = self.chunks.get(i)
+        if chunk is None:
+            chunk = self.chunks[i] = self.build_chunk(i)
+        else:
+            self.chunks.move_to_end(i)
+        return chunk
+
+    def prefetch(self, first, last, direction):
+        if direction > 0:
+            wanted = range(last + 1, last + 1 + self.PREFETCH)
+        elif direction < 0:
+            wanted = range(first - 1, first - 1 - self.PREFETCH, -1)
+        else:
+            wanted = [first - 1, last + 1]
+        builds = 0
+        for i in wanted:
+            if builds >= self.BUILDS_PER_FRAME:
+                break
+            if 0 <= i < self.chunk_count and i not in self.chunks:
+                self.chunks[i] = self.build_chunk(i)
+                builds += 1
+
+    def evict(self):
+        while len(self.chunks) > self.capacity:
+            self.chunks.popitem(last=False)
+            self.evicted += 1
+
+    def draw(self, surface, camera_x=0):
+        width = ScreenManager.WIDTH
+        first = camera_x // self.chunk_width
+        last = min((camera_x + width - 1) // self.chunk_width, self.chunk_count - 1)
+        left = ScreenManager.px(camera_x)
+        for i in range(first, last + 1):
+            surface.blit(self.chunk(i), (self.columns(i)[0] - left, 0))
+        self.prefetch(first, last, camera_x - self.last_x)
+        self.last_x = camera_x
+        self.evict()
@@ -0,0 +1,340 @@
+import socket
+import struct
+import selectors
+import threading
+from collections import deque
+from core.clock import clock
+from units.hero import Archer, Warrior, Mage, Healer
+from units.base import BaseTarget
+
+KEY = 0
+DELTA = 1
+HERO_KINDS = [Archer, Warrior, Mage, Healer]
+HERO_KIND = {cls.__name__: i for i, cls in enumerate(HERO_KINDS)}
+ENEMY_KIND_OFFSET = 16
+BASE_KIND = 255
+STATES = {"move": 0, "attack": 1, "skill": 2}
+DYING = 3
+
+LENGTH = struct.Struct("<I")
+FRAME = struct.Struct("<BIIBIffffIII")
+FRAME_ID = struct.Struct("<BI")
+NAME = struct.Struct("<B")
+UNIT = struct.Struct("<IBBihii")
+REMOVED = struct.Struct("<I")
+PROJECTILE = struct.Struct("<ih")
+
+class StateEncoder:
+    def __init__(self):
+        self.ids = {}
+        self.next_id = 1
+        self.previous = {}
+        self.seq = 0
+
+    def net_id(self, unit):
+        entry = self.ids.get(id(unit))
+        if entry is None or entry[1] is not unit:
+            entry = self.ids[id(unit)] = (self.next_id, unit)
+            self.next_id += 1
+        return entry[0]
+
+    def records(self, game):
+        enemy_kinds = {id(anims["move"]): ENEMY_KIND_OFFSET + i for i, anims in enumerate(game.enemy_sprites.values())}
+        records = {}
+        for h in game.heroes + game.dying_heroes:
+            state = DYING if h.is_dying else STATES.get(h.current_state, 0)
+            nid = self.net_id(h)
+            records[nid] = (nid, HERO_KIND[h.name], state, int(h.x), int(h.y), int(h.health), int(h.max_health))
+        for e in game.enemies:
+            if isinstance(e, BaseTarget):
+                kind, state = BASE_KIND, 0
+            else:
+                kind = enemy_kinds.get(id(e.animations["move"].frames), ENEMY_KIND_OFFSET)
+                state = DYING if e.is_dying else STATES.get(e.current_state, 0)
+            nid = self.net_id(e)
+            records[nid] = (nid, kind, state, int(e.x), int(e.y), int(e.health), int(e.max_health))
+        return records
+
+    def encode(self, game, keyframe=False):
+        records = self.records(game)
+        previous = self.previous
+        if keyframe:
+            changed = list(records.values())
+            removed = []
+        else:
+            changed = [r for nid, r in records.items() if previous.get(nid) != r]
+            removed = [nid for nid in previous if nid not in records]
+        self.ids = {k: v for k, v in self.ids.items() if v[0] in records}
+        self.previous = records
+        self.seq += 1
+
+        res = game.res_mgr
+        parts = [FRAME.pack(
+            KEY if keyframe else DELTA, self.seq, game.ticks, game.stage, game.world_width,
+            res.energy, res.max_energy, game.player_base.health, game.enemy_base.health,
+            len(changed), len(removed), len(game.projectiles)
+        )]
+        if keyframe:
+            names = list(game.enemy_sprites)
+            parts.append(NAME.pack(len(names)))
+            for name in names:
+                encoded = name.encode()
+                parts.append(NAME.pack(len(encoded)) + encoded)
+        parts += [UNIT.pack(*r) for r in changed]
+        parts += [REMOVED.pack(nid) for nid in removed]
+        parts += [PROJECTILE.pack(int(p.x), int(p.y)) for p in game.projectiles]
+        payload = b"".join(parts)
+        return LENGTH.pack(len(payload)) + payload
+
+class StateDecoder:
+    def __init__(self):
+        self.units = {}
+        self.projectiles = []
+        self.enemy_names = []
+        self.header = None
+        self.synced = False
+        self.seq = 0
+
+    def apply(self, payload):
+        (kind, seq, tick, stage, world_width, energy, max_energy, player_hp, enemy_hp,
+         n_units, n_removed, n_projectiles) = FRAME.unpack_from(payload)
+        offset = FRAME.size
+        if kind == DELTA and (not self.synced or seq != self.seq + 1):
+            self.synced = False
+            return False
+        if kind == KEY:
+            self.units = {}
+            (n,) = NAME.unpack_from(payload, offset)
+            offset += NAME.size
+            self.enemy_names = []
+            for _ in range(n):
+                (length,) = NAME.unpack_from(payload, offset)
+                offset += NAME.size
+                self.enemy_names.append(payload[offset:offset + length].decode())
+                offset += length
+            self.synced = True
+        for _ in range(n_units):
+            record = UNIT.unpack_from(payload, offset)
+            offset += UNIT.size
+            self.units[record[0]] = record
+        for _ in range(n_removed):
+            self.units.pop(REMOVED.unpack_from(payload, offset)[0], None)
+            offset += REMOVED.size
+        self.projectiles = [PROJECTILE.unpack_from(payload, offset + i * PROJECTILE.size) for i in range(n_projectiles)]
+        self.seq = seq
+        self.header = {
+            "tick": tick, "stage": stage, "world_width": world_width, "energy": energy, "max_energy": max_energy,
+            "player_base_health": player_hp, "enemy_base_health": enemy_hp,
+        }
+        return True
+
+    def kind_name(self, kind):
+        if kind == BASE_KIND:
+            return "Base"
+        if kind >= ENEMY_KIND_OFFSET:
+            i = kind - ENEMY_KIND_OFFSET
+            return self.enemy_names[i] if i < len(self.enemy_names) else "Enemy"
+        return HERO_KINDS[kind].__name__
+
+    def state(self):
+        return dict(self.header or {}, units=[
+            {"id": nid, "kind": self.kind_name(kind), "state": state, "x": x, "y": y, "health": hp, "max_health": max_hp}
+            for nid, kind, state, x, y, hp, max_hp in self.units.values()
+        ], projectiles=self.projectiles)
+
+class _Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.pending = deque()
+        self.pending_bytes = 0
+        self.partial = False
+        self.synced = False
+
+class StateBroadcaster:
+    HOST = "127.0.0.1"
+    PORT = 47800
+    RATE = 10
+    KEYFRAME_INTERVAL = 50
+    CLIENT_BUFFER = 1 << 20
+
+    def __init__(self, host=None, port=None, rate=None):
+        self.host = host or self.HOST
+        self.port = self.PORT if port is None else port
+        self.rate = rate or self.RATE
+        self.encoder = StateEncoder()
+        self.frames = deque(maxlen=4)
+        self.clients = []
+        self.client_count = 0
+        self.want_keyframe = True
+        self.last_publish = None
+        self.last_game = None
+        self.frames_sent = 0
+        self.last_seq = 0
+        self.running = False
+        self.selector = None
+        self.server = None
+        self.thread = None
+        self.wakeup = None
+
+    def start(self):
+        self.server = socket.create_server((self.host, self.port))
+        self.server.setblocking(False)
+        self.port = self.server.getsockname()[1]
+        self.wakeup, self.wake_write = socket.socketpair()
+        self.wakeup.setblocking(False)
+        self.wake_write.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ, "accept")
+        self.selector.register(self.wakeup, selectors.EVENT_READ, "wakeup")
+        self.running = True
+        self.thread = threading.Thread(target=self.serve, name="state-broadcast", daemon=True)
+        self.thread.start()
+        return self
+
+    def publish(self, game):
+        if not self.client_count:
+            return False
+        now = clock.now()
+        if game is not self.last_game:
+            self.last_game = game
+            self.want_keyframe = True
+        elif self.last_publish is not None and now - self.last_publish < 1 / self.rate:
+            return False
+        self.last_publish = now
+        keyframe = self.want_keyframe or self.encoder.seq % self.KEYFRAME_INTERVAL == 0
+        self.want_keyframe = False
+        self.frames.append(self.encoder.encode(game, keyframe))
+        try:
+            self.wake_write.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+        return True
+
+    def serve(self):
+        while self.running:
+            for key, mask in self.selector.select(0.5):
+                if key.data == "accept":
+                    self.accept()
+                elif key.data == "wakeup":
+                    try:
+                        self.wakeup.recv(4096)
+                    except BlockingIOError:
+                        pass
+                else:
+                    if mask & selectors.EVENT_READ:
+                        self.poll_closed(key.data)
+                    if mask & selectors.EVENT_WRITE:
+                        self.flush(key.data)
+            self.distribute()
+
+    def accept(self):
+        try:
+            sock, _ = self.server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        self.clients.append(client)
+        self.selector.register(sock, selectors.EVENT_READ, client)
+        self.client_count = len(self.clients)
+        self.want_keyframe = True
+
+    def distribute(self):
+        while self.frames:
+            frame = self.frames.popleft()
+            kind, seq = FRAME_ID.unpack_from(frame, LENGTH.size)
+            is_key = kind == KEY
+            if seq != self.last_seq + 1 and not is_key:
+                # a frame fell out of the handoff queue, so the delta chain is broken for everyone
+                for client in self.clients:
+                    client.synced = False
+                self.want_keyframe = True
+            self.last_seq = seq
+            for client in self.clients:
+                if not client.synced and not is_key:
+                    continue
+                if client.pending_bytes + len(frame) > self.CLIENT_BUFFER:
+                    # too far behind: drop its backlog and resume from the next keyframe, but finish
+                    # a frame it already started receiving or its length prefixes would desync
+                    client.pending = deque([client.pending[0]] if client.partial else [])
+                    client.pending_bytes = sum(map(len, client.pending))
+                    client.synced = False
+                    self.want_keyframe = True
+                    continue
+                client.synced = True
+                client.pending.append(frame)
+                client.pending_bytes += len(frame)
+                self.frames_sent += 1
+        for client in self.clients[:]:
+            if client.pending:
+                self.flush(client)
+
+    def flush(self, client):
+        while client.pending:
+            frame = client.pending[0]
+            try:
+                sent = client.sock.send(frame)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                self.drop(client)
+                return
+            client.pending_bytes -= sent
+            if sent < len(frame):
+                client.pending[0] = frame[sent:]
+                client.partial = client.partial or sent > 0
+                # only wait for writability while a backlog exists, otherwise select would spin
+                self.selector.modify(client.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, client)
+                return
+            client.pending.popleft()
+            client.partial = False
+        self.selector.modify(client.sock, selectors.EVENT_READ, client)
+
+    def poll_closed(self, client):
+        try:
+            if client.sock.recv(4096) == b"":
+                self.drop(client)
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.drop(client)
+
+    def drop(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+            self.selector.unregister(client.sock)
+            client.sock.close()
+            self.client_count = len(self.clients)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        try:
+            self.wake_write.send(b"\0")
+        except OSError:
+            pass
+        self.thread.join(timeout=2)
+        for client in self.clients[:]:
+            self.drop(client)
+        self.selector.close()
+        self.server.close()
+        self.wakeup.close()
+        self.wake_write.close()
+
+def read_frames(sock, buffer):
+    try:
+        data = sock.recv(1 << 16)
+    except BlockingIOError:
+        return [], True
+    if not data:
+        return [], False
+    buffer += data
+    frames = []
+    while len(buffer) >= LENGTH.size:
+        (length,) = LENGTH.unpack_from(buffer)
+        if len(buffer) < LENGTH.size + length:
+            break
+        frames.append(bytes(buffer[LENGTH.size:LENGTH.size + length]))
+        del buffer[:LENGTH.size + length]
+    return frames, True
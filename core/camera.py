@@ -0,0 +1,55 @@
+import pygame
+from core.screen import ScreenManager
+
+class Camera:
+    SCROLL_SPEED = 12
+    WHEEL_STEP = 80
+    EDGE_MARGIN = 16
+
+    def __init__(self, world_width, view_width=ScreenManager.WIDTH, view_height=ScreenManager.HEIGHT):
+        self.world_width = max(world_width, view_width)
+        self.view = pygame.Rect(0, 0, view_width, view_height)
+        self.edge_scroll = True
+
+    @property
+    def x(self):
+        return self.view.x
+
+    def is_scrollable(self):
+        return self.world_width > self.view.width
+
+    def move_to(self, x):
+        self.view.x = max(0, min(int(x), self.world_width - self.view.width))
+
+    def scroll(self, dx):
+        self.move_to(self.view.x + dx)
+
+    def center_on(self, x):
+        self.move_to(x - self.view.width // 2)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll((event.x - event.y) * self.WHEEL_STEP)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_HOME:
+                self.move_to(0)
+            elif event.key == pygame.K_END:
+                self.move_to(self.world_width)
+
+    def update(self, keys, mouse_pos=None):
+        if not self.is_scrollable():
+            return
+        dx = 0
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            dx -= self.SCROLL_SPEED
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            dx += self.SCROLL_SPEED
+        if self.edge_scroll and mouse_pos is not None:
+            # the mouse reports render target pixels, the view is in layout units
+            mouse_x = mouse_pos[0] / ScreenManager.RENDER_SCALE
+            if mouse_x < self.EDGE_MARGIN:
+                dx -= self.SCROLL_SPEED
+            elif mouse_x >= self.view.width - self.EDGE_MARGIN:
+                dx += self.SCROLL_SPEED
+        if dx:
+            self.scroll(dx)
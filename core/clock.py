@@ -0,0 +1,22 @@
+import time
+
+class GameClock:
+    def __init__(self):
+        self.sim_time = None
+
+    def now(self):
+        return time.time() if self.sim_time is None else self.sim_time
+
+    def is_simulated(self):
+        return self.sim_time is not None
+
+    def use_simulated(self, start=None):
+        self.sim_time = time.time() if start is None else start
+
+    def use_wall(self):
+        self.sim_time = None
+
+    def advance(self, dt):
+        self.sim_time += dt
+
+clock = GameClock()
@@ -0,0 +1,143 @@
+import struct
+import random
+from array import array
+from collections import defaultdict
+from core.clock import clock
+from core.events import Damage, Heal
+
+MAGIC = b"CLOG"
+VERSION = 1
+# magic, version, session start, seconds into the session when the block was cut, sample rate, records, names
+BLOCK = struct.Struct("<4sBdffIB")
+NAME = struct.Struct("<B")
+KINDS = {Damage: 0, Heal: 1}
+COLUMNS = (("ticks", "I"), ("kinds", "B"), ("sources", "B"), ("targets", "B"), ("amounts", "f"))
+
+class CombatLog:
+    # buffers sampled Damage/Heal events in typed columns and appends them to a binary file in blocks;
+    # each block carries its own name table so a truncated file still reads up to the last whole block
+    FLUSH_RECORDS = 1 << 16
+
+    def __init__(self, path, sample=1.0):
+        self.path = path
+        self.sample = min(max(sample, 0.0), 1.0)
+        self.session_start = clock.now()
+        self.names = {}
+        self.blocks = []
+        self.seen = 0
+        self.kept = 0
+        self.reset_columns()
+
+    def reset_columns(self):
+        for name, code in COLUMNS:
+            setattr(self, name, array(code))
+
+    def name_id(self, name):
+        i = self.names.get(name)
+        if i is None:
+            i = self.names[name] = len(self.names)
+        return i
+
+    def on_events(self, batch):
+        sample = self.sample
+        rand = random.random
+        kinds = KINDS
+        for e in batch:
+            kind = kinds.get(type(e))
+            if kind is None:
+                continue
+            self.seen += 1
+            if sample < 1.0 and rand() >= sample:
+                continue
+            self.ticks.append(e.tick)
+            self.kinds.append(kind)
+            self.sources.append(self.name_id(e.source))
+            self.targets.append(self.name_id(e.target))
+            self.amounts.append(e.amount)
+        if len(self.ticks) >= self.FLUSH_RECORDS:
+            self.cut()
+
+    def cut(self, now=None):
+        now = clock.now() if now is None else now
+        n = len(self.ticks)
+        self.kept += n
+        parts = [BLOCK.pack(MAGIC, VERSION, self.session_start, now - self.session_start, self.sample, n, len(self.names))]
+        for name in self.names:
+            encoded = name.encode()[:255]
+            parts.append(NAME.pack(len(encoded)) + encoded)
+        parts += [getattr(self, name).tobytes() for name, _ in COLUMNS]
+        self.blocks.append(b"".join(parts))
+        self.reset_columns()
+
+    def end_session(self, now):
+        # always cut, even when empty, so the reader learns how long the session lasted
+        self.cut(now)
+        self.session_start = now
+        self.names = {}
+
+    def flush(self):
+        if len(self.ticks):
+            self.cut()
+        if not self.blocks:
+            return
+        with open(self.path, "ab") as f:
+            f.writelines(self.blocks)
+        self.blocks.clear()
+
+def read_blocks(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + BLOCK.size <= len(data):
+        magic, version, session, elapsed, sample, n, n_names = BLOCK.unpack_from(data, offset)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: bad block header at byte {offset}")
+        offset += BLOCK.size
+        names = []
+        for _ in range(n_names):
+            (length,) = NAME.unpack_from(data, offset)
+            names.append(data[offset + NAME.size:offset + NAME.size + length].decode())
+            offset += NAME.size + length
+        columns = {}
+        for name, code in COLUMNS:
+            column = array(code)
+            size = n * column.itemsize
+            if offset + size > len(data):
+                return
+            column.frombytes(data[offset:offset + size])
+            columns[name] = column
+            offset += size
+        yield {"session": session, "elapsed": elapsed, "sample": sample, "names": names, **columns}
+
+def breakdown(path):
+    # per session and source type: damage and healing dealt, scaled back up by the sample rate
+    sessions = {}
+    for block in read_blocks(path):
+        session = sessions.get(block["session"])
+        if session is None:
+            session = sessions[block["session"]] = {
+                "start": block["session"], "duration": 0.0, "events": 0,
+                "sources": defaultdict(lambda: {"damage": 0.0, "heal": 0.0, "hits": 0, "heals": 0, "targets": defaultdict(float)}),
+            }
+        session["duration"] = max(session["duration"], block["elapsed"])
+        if not block["ticks"]:
+            continue
+        weight = 1 / block["sample"] if block["sample"] else 0.0
+        names = block["names"]
+        session["events"] += len(block["ticks"])
+        for kind, source, target, amount in zip(block["kinds"], block["sources"], block["targets"], block["amounts"]):
+            stats = session["sources"][names[source]]
+            amount *= weight
+            if kind == KINDS[Damage]:
+                stats["damage"] += amount
+                stats["hits"] += weight
+            else:
+                stats["heal"] += amount
+                stats["heals"] += weight
+            stats["targets"][names[target]] += amount
+    for session in sessions.values():
+        duration = session["duration"]
+        for stats in session["sources"].values():
+            stats["dps"] = stats["damage"] / duration if duration else 0.0
+            stats["hps"] = stats["heal"] / duration if duration else 0.0
+    return sorted(sessions.values(), key=lambda s: s["start"])
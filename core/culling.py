@@ -0,0 +1,76 @@
+import pygame
+from core.screen import ScreenManager
+from core.render import BADGES, PROJECTILES
+
+class CullingManager:
+    LOD_THRESHOLD = 40
+    LOD_CELL = 16
+
+    def __init__(self, view=None, lod_threshold=LOD_THRESHOLD, lod_cell=LOD_CELL):
+        self.view = view or pygame.Rect(0, 0, ScreenManager.WIDTH, ScreenManager.HEIGHT)
+        self.lod_threshold = lod_threshold
+        self.lod_cell = lod_cell
+        self.font = None
+        self._badges = {}
+        self.drawn = 0
+        self.culled = 0
+
+    def visible(self, units):
+        view = self.view
+        visible = [u for u in units if view.colliderect(u.draw_rect())]
+        self.culled += len(units) - len(visible)
+        return visible
+
+    def submit_projectiles(self, queue, projectiles):
+        # thousands per frame in a storm, so cull and submit in one pass without per-projectile method calls
+        view = self.view
+        camera_x, left, right, top, bottom = view.x, view.left, view.right, view.top, view.bottom
+        entries = [(p.image, (p.x - camera_x - p.half_width, p.y - p.half_height)) for p in projectiles
+                   if left - p.half_width < p.x < right + p.half_width and top - p.half_height < p.y < bottom + p.half_height]
+        self.culled += len(projectiles) - len(entries)
+        queue.extend(entries, PROJECTILES)
+
+    def lod_key(self, unit):
+        anims = getattr(unit, "animations", None)
+        if anims is None:
+            return None
+        frames = unit.dead_anim.frames if unit.is_dying else anims[unit.current_state].frames
+        return id(frames), int(unit.x) // self.lod_cell
+
+    def badge(self, count):
+        surf = self._badges.get(count)
+        if surf is None:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 18)
+            surf = self.font.render(f"x{count}", True, ScreenManager.BLACK)
+            self._badges[count] = surf
+        return surf
+
+    def submit_units(self, queue, units):
+        visible = self.visible(units)
+        camera_x = self.view.x
+        if self.lod_threshold is None or len(visible) <= self.lod_threshold:
+            for u in visible:
+                u.submit(queue, camera_x)
+            self.drawn += len(visible)
+            return
+
+        groups = {}
+        for u in visible:
+            key = self.lod_key(u)
+            if key is None:
+                u.submit(queue, camera_x)
+                self.drawn += 1
+            else:
+                groups.setdefault(key, []).append(u)
+
+        for group in groups.values():
+            leader = group[0]
+            leader.submit(queue, camera_x)
+            self.drawn += 1
+            if len(group) > 1:
+                queue.submit(self.badge(len(group)), (leader.x - camera_x + 22, leader.y + leader.bar_offset - 3), BADGES)
+
+    def reset_stats(self):
+        self.drawn = 0
+        self.culled = 0
@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+HeroSpawned = namedtuple("HeroSpawned", ["tick", "name"])
+UnitDied = namedtuple("UnitDied", ["tick", "side", "name"])
+Damage = namedtuple("Damage", ["tick", "source", "target", "amount"])
+Heal = namedtuple("Heal", ["tick", "source", "target", "amount"])
+SkillCast = namedtuple("SkillCast", ["tick", "caster", "skill"])
+EnergySpent = namedtuple("EnergySpent", ["tick", "amount", "reason"])
+
+def unit_name(unit):
+    return getattr(unit, "name", None) or type(unit).__name__
+
+class EventBus:
+    def __init__(self):
+        self.subscribers = []
+        self.buffer = []
+        self.active = False
+        self.wanted = set()
+        self.tick = 0
+
+    def subscribe(self, subscriber, types=None):
+        self.subscribers.append((subscriber, tuple(types) if types else None))
+        self.update_wanted()
+
+    def unsubscribe(self, subscriber):
+        self.subscribers = [(s, t) for s, t in self.subscribers if s is not subscriber]
+        self.update_wanted()
+
+    def update_wanted(self):
+        self.active = bool(self.subscribers)
+        self.wanted = set()
+        for _, types in self.subscribers:
+            if types is None:
+                self.wanted = None
+                return
+            self.wanted.update(types)
+
+    def wants(self, event_type):
+        return self.active and (self.wanted is None or event_type in self.wanted)
+
+    def reset(self):
+        # a new battle: drop undelivered events and restart the tick, subscribers stay attached
+        self.buffer = []
+        self.tick = 0
+
+    def emit(self, event_type, *fields):
+        if self.active:
+            self.buffer.append(event_type(self.tick, *fields))
+
+    def flush(self):
+        self.tick += 1
+        if not self.buffer:
+            return
+        batch = self.buffer
+        self.buffer = []
+        for subscriber, types in self.subscribers:
+            if types is None:
+                subscriber.on_events(batch)
+            else:
+                selected = [e for e in batch if isinstance(e, types)]
+                if selected:
+                    subscriber.on_events(selected)
+
+events = EventBus()
@@ -0,0 +1,139 @@
+import os
+import gc
+import weakref
+from collections import Counter
+import tracemalloc
+import pygame
+from core.animation import textures
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WATCHED_CLASSES = ("GameManager", "Hero", "Enemy", "Projectile", "Animation")
+# per-battle lists on GameManager (RemoteGame keeps units and projectiles)
+GAME_OBJECTS = ("heroes", "dying_heroes", "enemies", "dying_enemies", "units", "projectiles")
+
+def subsystem(filename):
+    if filename.startswith("<"):
+        return "other"
+    path = os.path.abspath(filename)
+    if path.startswith(ROOT + os.sep):
+        parts = os.path.relpath(path, ROOT).split(os.sep)
+        return parts[0] if len(parts) > 1 else parts[0].replace(".py", "")
+    if "pygame" in path:
+        return "pygame"
+    if "tkinter" in path:
+        return "tkinter"
+    return "other"
+
+def surface_bytes(root):
+    seen = set()
+    surfaces = {}
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, pygame.Surface):
+            parent = obj.get_abs_parent()
+            surfaces[id(parent)] = parent.get_pitch() * parent.get_height()
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            stack.extend(vars(obj).values())
+    return sum(surfaces.values())
+
+def count_instances(names=WATCHED_CLASSES):
+    counts = dict.fromkeys(names, 0)
+    matches = {}
+    for obj in gc.get_objects():
+        cls = type(obj)
+        found = matches.get(cls)
+        if found is None:
+            found = matches[cls] = [c.__name__ for c in cls.__mro__ if c.__name__ in counts]
+        for name in found:
+            counts[name] += 1
+    return counts
+
+class MemoryProfiler:
+    def __init__(self, frames=1):
+        self.frames = frames
+        self.baseline = None
+        self.expected_dead = []
+        self.reports = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def by_subsystem(self, snapshot):
+        totals = {}
+        for stat in snapshot.statistics("filename"):
+            key = subsystem(stat.traceback[0].filename)
+            totals[key] = totals.get(key, 0) + stat.size
+        return totals
+
+    def expect_freed(self, obj, label=None):
+        self.expected_dead.append((weakref.ref(obj), label or type(obj).__name__))
+
+    def expect_game_freed(self, game):
+        # a leak can hold a unit or projectile without its game, so each is checked on its own
+        self.expect_freed(game)
+        for name in GAME_OBJECTS:
+            for obj in getattr(game, name, ()):
+                self.expect_freed(obj)
+                for anim in getattr(obj, "animations", {}).values():
+                    self.expect_freed(anim)
+                if hasattr(obj, "dead_anim"):
+                    self.expect_freed(obj.dead_anim)
+
+    def survivors(self):
+        alive = []
+        for ref, label in self.expected_dead:
+            obj = ref()
+            if obj is not None:
+                referrers = sorted({type(r).__name__ for r in gc.get_referrers(obj) if r is not self.expected_dead})
+                alive.append((label, referrers))
+        self.expected_dead = [(ref, label) for ref, label in self.expected_dead if ref() is not None]
+        return alive
+
+    def checkpoint(self, label, live=None):
+        gc.collect()
+        totals = self.by_subsystem(tracemalloc.take_snapshot())
+        if self.baseline is None:
+            self.baseline = totals
+        report = {
+            "label": label,
+            "traced_bytes": sum(totals.values()),
+            "subsystems": {k: (v, v - self.baseline.get(k, 0)) for k, v in sorted(totals.items())},
+            "instances": count_instances(),
+            "surface_bytes": surface_bytes(live) if live is not None else 0,
+            "texture_bytes": textures.bytes,
+            "survivors": self.survivors(),
+        }
+        report["flags"] = self.flags(report)
+        self.reports.append(report)
+        return report
+
+    def flags(self, report):
+        survivors = Counter((label, tuple(refs)) for label, refs in report["survivors"])
+        flags = [f"{count} x {label} survived its transition (held by {', '.join(refs) or 'unknown'})"
+                 for (label, refs), count in survivors.items()]
+        instances = report["instances"]
+        if instances["GameManager"] > 1:
+            flags.append(f"{instances['GameManager']} GameManager instances alive")
+        return flags
+
+    def format(self, report):
+        lines = [f"[mem] {report['label']}: traced {report['traced_bytes'] / 1024:.0f} KiB, "
+                 f"surfaces {report['surface_bytes'] / 1024:.0f} KiB, "
+                 f"textures {report['texture_bytes'] / 1024:.0f}/{textures.limit / 1024:.0f} KiB"]
+        for name, (size, delta) in report["subsystems"].items():
+            lines.append(f"[mem]   {name:<10} {size / 1024:9.0f} KiB  ({delta / 1024:+.0f})")
+        counts = ", ".join(f"{k}={v}" for k, v in report["instances"].items())
+        lines.append(f"[mem]   live: {counts}")
+        for flag in report["flags"]:
+            lines.append(f"[mem]   !! {flag}")
+        return "\n".join(lines)
+
+    def stop(self):
+        tracemalloc.stop()
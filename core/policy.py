@@ -0,0 +1,126 @@
+import random
+from collections import namedtuple
+from units.base import BaseTarget
+from units.hero import Archer, Warrior, Mage, Healer
+
+SPAWN = "spawn"
+UPGRADE = "upgrade"
+
+HERO_NAMES = tuple(cls.__name__ for cls in (Archer, Warrior, Mage, Healer))
+
+Action = namedtuple("Action", ["kind", "index"])
+Observation = namedtuple("Observation", [
+    "tick", "stage", "energy", "max_energy", "upgrade_cost", "can_upgrade",
+    "hero_names", "hero_costs", "hero_ready", "hero_count", "enemy_count",
+    "nearest_enemy_x", "player_base_health", "enemy_base_health",
+])
+
+def spawn(index):
+    return Action(SPAWN, index)
+
+def upgrade():
+    return Action(UPGRADE, None)
+
+def observe(game):
+    res = game.res_mgr
+    enemy_count = 0
+    nearest = None
+    for e in game.enemies:
+        if e.alive and not isinstance(e, BaseTarget):
+            enemy_count += 1
+            if nearest is None or e.x < nearest:
+                nearest = e.x
+    return Observation(
+        tick=game.ticks,
+        stage=game.stage,
+        energy=res.energy,
+        max_energy=res.max_energy,
+        upgrade_cost=res.upgrade_cost(),
+        can_upgrade=res.can_upgrade(),
+        hero_names=tuple(b.cls.__name__ for b in game.hero_buttons),
+        hero_costs=tuple(b.cost for b in game.hero_buttons),
+        hero_ready=tuple(b.is_ready() and res.can_afford(b.cost) for b in game.hero_buttons),
+        hero_count=len(game.heroes),
+        enemy_count=enemy_count,
+        nearest_enemy_x=nearest,
+        player_base_health=game.player_base.health,
+        enemy_base_health=game.enemy_base.health,
+    )
+
+def apply_action(game, action):
+    if action.kind == SPAWN:
+        return game.hero_buttons[action.index].try_spawn(game)
+    if action.kind == UPGRADE:
+        return game.upgrade_button.try_upgrade(game.res_mgr)
+    raise ValueError(f"unknown action kind: {action.kind}")
+
+class Policy:
+    def act(self, obs):
+        return []
+
+    def reset(self):
+        pass
+
+class GreedyPolicy(Policy):
+    def act(self, obs):
+        ready = [i for i, ok in enumerate(obs.hero_ready) if ok]
+        if ready:
+            return [spawn(max(ready, key=lambda i: obs.hero_costs[i]))]
+        if obs.can_upgrade and obs.energy >= obs.max_energy:
+            return [upgrade()]
+        return []
+
+class CostWeightedRandomPolicy(Policy):
+    def __init__(self, seed=None, upgrade_chance=0.01):
+        self.seed = seed
+        self.upgrade_chance = upgrade_chance
+        self.rng = random.Random(seed)
+
+    def reset(self):
+        self.rng = random.Random(self.seed)
+
+    def act(self, obs):
+        if obs.can_upgrade and self.rng.random() < self.upgrade_chance:
+            return [upgrade()]
+        ready = [i for i, ok in enumerate(obs.hero_ready) if ok]
+        if not ready:
+            return []
+        weights = [obs.hero_costs[i] for i in ready]
+        return [spawn(self.rng.choices(ready, weights)[0])]
+
+class ScriptedPolicy(Policy):
+    def __init__(self, script, hero_names=HERO_NAMES):
+        script = list(script)
+        for step in script:
+            # checked up front, a bad step would otherwise only surface when the battle reaches its tick
+            if len(step) != 2 or not isinstance(step[0], (int, float)):
+                raise ValueError(f"script step {step!r} is not (tick, hero_name | {UPGRADE!r})")
+            if step[1] != UPGRADE and step[1] not in hero_names:
+                raise ValueError(f"script step {step!r} names unknown hero {step[1]!r}, expected one of {', '.join(hero_names)}")
+        self.script = sorted(script, key=lambda step: step[0])
+        self.position = 0
+
+    def reset(self):
+        self.position = 0
+
+    def act(self, obs):
+        if self.position >= len(self.script):
+            return []
+        tick, name = self.script[self.position]
+        if obs.tick < tick:
+            return []
+        if name == UPGRADE:
+            if not obs.can_upgrade:
+                return []
+            self.position += 1
+            return [upgrade()]
+        index = obs.hero_names.index(name)
+        if not obs.hero_ready[index]:
+            return []
+        self.position += 1
+        return [spawn(index)]
+
+POLICIES = {
+    "greedy": GreedyPolicy,
+    "random": CostWeightedRandomPolicy,
+}
@@ -0,0 +1,55 @@
+import weakref
+import pygame
+from core.screen import ScreenManager
+
+PROJECTILES, SPRITES, BARS, MARKERS, BADGES = range(5)
+
+_scaled = weakref.WeakKeyDictionary()
+
+def scaled(surface):
+    # sprites, bars and images are authored in layout units; a smaller render target gets a shrunk copy, made once
+    if ScreenManager.RENDER_SCALE == 1:
+        return surface
+    copy = _scaled.get(surface)
+    if copy is None:
+        w, h = surface.get_size()
+        copy = pygame.transform.scale(surface, (max(ScreenManager.px(w), 1), max(ScreenManager.px(h), 1)))
+        key = surface.get_colorkey()
+        if key is not None:
+            copy.set_colorkey(key, pygame.RLEACCEL)
+        _scaled[surface] = copy
+    return copy
+
+class RenderQueue:
+    # units append (surface, position) entries per layer; flush() draws the layers bottom to top, each in
+    # one batched call, so a crowded frame costs a few C calls instead of a Python blit per sprite and bar.
+    # Positions are in layout units and are mapped to the render target at flush.
+    LAYERS = 5
+    BATCH = getattr(pygame.Surface, "fblits", None)
+
+    def __init__(self):
+        self.layers = [[] for _ in range(self.LAYERS)]
+        self.scale = ScreenManager.RENDER_SCALE
+
+    def submit(self, surface, position, layer=SPRITES):
+        self.layers[layer].append((surface, position))
+
+    def extend(self, entries, layer=SPRITES):
+        self.layers[layer] += entries
+
+    def flush(self, target):
+        batch = self.BATCH
+        scale = self.scale
+        for entries in self.layers:
+            if entries:
+                if scale != 1:
+                    entries[:] = [(scaled(surf), (round(x * scale), round(y * scale))) for surf, (x, y) in entries]
+                if batch:
+                    batch(target, entries)
+                else:
+                    target.blits(entries, False)
+                entries.clear()
+
+    def clear(self):
+        for entries in self.layers:
+            entries.clear()
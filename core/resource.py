@@ -1,6 +1,8 @@
-import time
+from core.clock import clock
 
 class ResourceManager:
+    MAX_UPGRADES = 5
+
     def __init__(self):
         self.energy = 100
         self.max_energy = 100
@@ -20,11 +22,16 @@ class ResourceManager:
             if self.energy > self.max_energy:
                 self.energy = self.max_energy
 
+    def upgrade_cost(self):
+        return 20 + 10 * self.upgrade_clicks
+
+    def can_upgrade(self):
+        return self.upgrade_clicks < self.MAX_UPGRADES and self.energy >= self.upgrade_cost()
+
     def upgrade_energy(self):
-        upgrade_cost = 20 + 10 * self.upgrade_clicks
-        if self.upgrade_clicks < 5 and self.energy >= upgrade_cost:
-            self.energy -= upgrade_cost
+        if self.can_upgrade():
+            self.energy -= self.upgrade_cost()
             self.max_energy += 10
             self.regen_rate += 0.01
             self.upgrade_clicks += 1
-            self.last_upgrade_display_time = time.time()
+            self.last_upgrade_display_time = clock.now()
@@ -1,27 +1,92 @@
 import pygame
 
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
 class ScreenManager:
+    # world and layout units; the render target is this size times RENDER_SCALE
     WIDTH, HEIGHT = 800, 400
+    RENDER_SCALE = 1.0
+    WINDOW_SIZE = None
+    SCALE_MODE = "pixel"
     WHITE = (255, 255, 255)
     RED = (200, 0, 0)
     GREEN = (0, 200, 0)
     BLACK = (0, 0, 0)
     FPS = 60
+    IDLE_TIMEOUT_MS = 50
+    # pygame.init() would also open the audio device and joysticks, which the game never uses
+    SUBSYSTEMS = (pygame.display, pygame.font)
 
-    def __init__(self):
-        pygame.init()
-        self.surface = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+    def __init__(self, window_size=None, scale_mode=None):
+        for subsystem in self.SUBSYSTEMS:
+            subsystem.init()
+        self.window_size = tuple(window_size or self.WINDOW_SIZE or (self.WIDTH, self.HEIGHT))
+        self.scale_mode = scale_mode or self.SCALE_MODE
+        self.surface = self.create_render_target()
         pygame.display.set_caption("Battle Heroes Defense")
         self.clock = pygame.time.Clock()
 
+    @classmethod
+    def px(cls, length):
+        # a length in layout units as render target pixels
+        return round(length * cls.RENDER_SCALE)
+
+    @classmethod
+    def target_size(cls):
+        return cls.px(cls.WIDTH), cls.px(cls.HEIGHT)
+
+    @classmethod
+    def to_target(cls, pos):
+        # window pixels to render target pixels
+        window = pygame.display.get_surface()
+        target_w, target_h = cls.target_size()
+        if window is None or window.get_size() == (target_w, target_h):
+            return pos
+        window_w, window_h = window.get_size()
+        return pos[0] * target_w // window_w, pos[1] * target_h // window_h
+
+    @classmethod
+    def mouse_pos(cls):
+        return cls.to_target(pygame.mouse.get_pos())
+
+    def create_render_target(self):
+        target_size = self.target_size()
+        display = pygame.display.get_surface()
+        if display is None or display.get_size() not in (self.window_size, target_size):
+            display = pygame.display.set_mode(self.window_size)
+        self.display = display
+        if display.get_size() == target_size:
+            return display
+        # draw at the target size and scale it into the window once per frame in update()
+        return pygame.Surface(target_size).convert()
+
     def fill(self, color):
         self.surface.fill(color)
 
     def update(self):
+        if self.surface is not self.display:
+            scale = pygame.transform.scale if self.scale_mode == "pixel" else pygame.transform.smoothscale
+            scale(self.surface, self.display.get_size(), self.display)
         pygame.display.flip()
 
     def tick(self):
         self.clock.tick(self.FPS)
 
+    def wait_events(self, timeout_ms=None):
+        event = pygame.event.wait(self.IDLE_TIMEOUT_MS if timeout_ms is None else timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return self.map_events([event] + pygame.event.get())
+
+    def get_events(self):
+        return self.map_events(pygame.event.get())
+
+    def map_events(self, events):
+        if self.surface is not self.display:
+            for event in events:
+                if event.type in MOUSE_EVENTS:
+                    event.pos = self.to_target(event.pos)
+        return events
+
     def quit(self):
         pygame.quit()
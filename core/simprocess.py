@@ -0,0 +1,227 @@
+import os
+import queue
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+from core.broadcast import HERO_KIND, STATES, DYING, ENEMY_KIND_OFFSET
+from units.base import BaseTarget
+
+RESULTS = ("", "win", "loss", "quit", "timeout")
+CONTROL = struct.Struct("<I")
+SEQ = struct.Struct("<I")
+FRAME = struct.Struct("<IIBBBBIffffBddd4dII")
+UNIT = struct.Struct("<BBBBih")
+PROJECTILE = struct.Struct("<ih")
+
+class Snapshot:
+    __slots__ = ("game_id", "tick", "stage", "over", "result", "paused", "world_width", "energy", "max_energy",
+                 "player_base_health", "enemy_base_health", "upgrade_clicks", "upgrade_display_time",
+                 "upgrade_time", "upgrade_fail_time", "button_times", "units", "projectiles")
+
+class SnapshotBuffer:
+    MAX_UNITS = 16384
+    MAX_PROJECTILES = 16384
+    SLOT_SIZE = SEQ.size + FRAME.size + MAX_UNITS * UNIT.size + MAX_PROJECTILES * PROJECTILE.size
+
+    def __init__(self, name=None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=CONTROL.size + 2 * self.SLOT_SIZE)
+            self.owner = True
+        else:
+            # the spawned child shares its parent's resource tracker, so only the creator unlinks
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buf = self.shm.buf
+        self.name = self.shm.name
+        self.seqs = [0, 0]
+        self.last = None
+
+    def slot(self, index):
+        return CONTROL.size + index * self.SLOT_SIZE
+
+    def write(self, game, game_id, button_times, upgrade_button):
+        units = unit_records(game)[:self.MAX_UNITS]
+        projectiles = [PROJECTILE.pack(int(p.x), int(p.y)) for p in game.projectiles[:self.MAX_PROJECTILES]]
+        res = game.res_mgr
+        header = FRAME.pack(
+            game_id, game.ticks, game.stage, not game.running, RESULTS.index(game.result()) if not game.running else 0,
+            game.paused, game.world_width, res.energy, res.max_energy, game.player_base.health, game.enemy_base.health,
+            res.upgrade_clicks, res.last_upgrade_display_time, upgrade_button.last_upgrade_time,
+            upgrade_button.last_fail_time, *button_times, len(units), len(projectiles)
+        )
+        payload = b"".join([header] + units + projectiles)
+
+        # write into the slot the reader is not looking at, bracketed by an odd/even sequence number
+        index = 1 - CONTROL.unpack_from(self.buf)[0] if any(self.seqs) else 0
+        start = self.slot(index)
+        self.seqs[index] += 1
+        SEQ.pack_into(self.buf, start, self.seqs[index])
+        self.buf[start + SEQ.size:start + SEQ.size + len(payload)] = payload
+        self.seqs[index] += 1
+        SEQ.pack_into(self.buf, start, self.seqs[index])
+        CONTROL.pack_into(self.buf, 0, index)
+
+    def read(self, retries=3):
+        # returns the newest complete snapshot, or None if nothing new has been published
+        buf = self.buf
+        for _ in range(retries):
+            index = CONTROL.unpack_from(buf)[0]
+            start = self.slot(index)
+            seq = SEQ.unpack_from(buf, start)[0]
+            if seq == 0 or seq & 1 or (index, seq) == self.last:
+                return None
+            offset = start + SEQ.size
+            fields = FRAME.unpack_from(buf, offset)
+            n_units, n_projectiles = fields[-2:]
+            offset += FRAME.size
+            end = offset + n_units * UNIT.size
+            units = list(UNIT.iter_unpack(buf[offset:end]))
+            projectiles = list(PROJECTILE.iter_unpack(buf[end:end + n_projectiles * PROJECTILE.size]))
+            if SEQ.unpack_from(buf, start)[0] != seq:
+                # the writer lapped us mid-read, try the other slot
+                continue
+            self.last = (index, seq)
+            snap = Snapshot()
+            (snap.game_id, snap.tick, snap.stage, over, result, paused, snap.world_width, snap.energy, snap.max_energy,
+             snap.player_base_health, snap.enemy_base_health, snap.upgrade_clicks, snap.upgrade_display_time,
+             snap.upgrade_time, snap.upgrade_fail_time) = fields[:15]
+            snap.over, snap.paused, snap.result = bool(over), bool(paused), RESULTS[result]
+            snap.button_times = fields[15:19]
+            snap.units = units
+            snap.projectiles = projectiles
+            return snap
+        return None
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def unit_records(game):
+    enemy_kinds = {id(anims["move"]): ENEMY_KIND_OFFSET + i for i, anims in enumerate(game.enemy_sprites.values())}
+    records = []
+    pack = UNIT.pack
+    for h in game.heroes:
+        if h.alive and h.current_state in h.animations:
+            anim = h.animations[h.current_state]
+            records.append(pack(HERO_KIND[h.name], STATES.get(h.current_state, 0), anim.index,
+                                int(255 * max(h.health, 0) / h.max_health), int(h.x), int(h.y)))
+    for e in game.enemies:
+        if isinstance(e, BaseTarget):
+            continue
+        if e.is_dying:
+            if e.dead_anim.finished:
+                continue
+            state, anim = DYING, e.dead_anim
+        elif e.alive:
+            state, anim = STATES.get(e.current_state, 0), e.animations[e.current_state]
+        else:
+            continue
+        kind = enemy_kinds.get(id(e.animations["move"].frames), ENEMY_KIND_OFFSET)
+        records.append(pack(kind, state, anim.index, int(255 * max(e.health, 0) / e.max_health), int(e.x), int(e.y)))
+    for h in game.dying_heroes:
+        records.append(pack(HERO_KIND[h.name], DYING, h.dead_anim.index, 0, int(h.x), int(h.y)))
+    return records
+
+def run_simulation(game_cls, shm_name, commands, policy=None, broadcast=None, overrides=()):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    for cls, name, value in overrides:
+        setattr(cls, name, value)
+    import pygame
+    from core.screen import ScreenManager
+    from core.broadcast import StateBroadcaster
+
+    buffer = SnapshotBuffer(shm_name)
+    broadcaster = StateBroadcaster(port=broadcast[0], rate=broadcast[1]).start() if broadcast else None
+    ticker = pygame.time.Clock()
+    game = None
+    game_id = 0
+    finished = False
+    try:
+        while True:
+            idle = game is None or not game.running
+            try:
+                command = commands.get() if idle else commands.get_nowait()
+            except queue.Empty:
+                command = None
+            while command is not None:
+                kind, args = command[0], command[1:]
+                if kind == "stop":
+                    if game is not None and not finished:
+                        game.finish("quit")
+                    return
+                if kind == "start":
+                    game_id, stage, resume = args
+                    game = game_cls()
+                    finished = False
+                    game.stage = stage
+                    if resume and not game.load_checkpoint():
+                        game = game_cls()
+                elif game is not None and game.running:
+                    if kind == "spawn":
+                        game.hero_buttons[args[0]].try_spawn(game)
+                    elif kind == "upgrade":
+                        game.upgrade_button.try_upgrade(game.res_mgr)
+                    elif kind == "settings":
+                        game.handle_settings_command(args[0])
+                try:
+                    command = commands.get_nowait()
+                except queue.Empty:
+                    command = None
+
+            if game is None:
+                continue
+            if game.running and not game.paused:
+                if policy:
+                    game.step_policy(policy)
+                game.spawn_enemy()
+                game.update()
+                game.advance_animations()
+                game.try_checkpoint()
+                if broadcaster:
+                    broadcaster.publish(game)
+            if not game.running and not finished:
+                game.finish()
+                finished = True
+            buffer.write(game, game_id, [b.last for b in game.hero_buttons], game.upgrade_button)
+            if game.running:
+                ticker.tick(ScreenManager.FPS)
+    finally:
+        if broadcaster:
+            broadcaster.stop()
+        buffer.close()
+
+class SimulationProcess:
+    JOIN_TIMEOUT = 2
+
+    def __init__(self, game_cls, policy=None, broadcast=None, overrides=()):
+        # spawn rather than fork: the render process already owns a window and SDL state
+        context = multiprocessing.get_context("spawn")
+        self.buffer = SnapshotBuffer()
+        self.commands = context.Queue()
+        self.process = context.Process(
+            target=run_simulation, args=(game_cls, self.buffer.name, self.commands, policy, broadcast, overrides),
+            name="simulation", daemon=True
+        )
+        self.process.start()
+        self.game_id = 0
+
+    def start_game(self, stage=1, resume=False):
+        self.game_id += 1
+        self.send("start", self.game_id, stage, resume)
+        return self.game_id
+
+    def send(self, *command):
+        self.commands.put(command)
+
+    def read(self):
+        return self.buffer.read()
+
+    def stop(self):
+        if self.process.is_alive():
+            self.send("stop")
+            self.process.join(timeout=self.JOIN_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.buffer.close()
@@ -0,0 +1,288 @@
+import os
+import math
+from core.clock import clock
+import random
+import struct
+from units.hero import Archer, Warrior, Mage, Healer
+from units.enemy import Enemy
+from units.base import BaseTarget
+from core.screen import ScreenManager
+
+MAGIC = b"BHS2"
+LEGACY_MAGIC = b"BHS1"
+NAN = float("nan")
+BASE_KIND = 255
+
+HERO_TYPES = [Archer, Warrior, Mage, Healer]
+HERO_INDEX = {cls.__name__: i for i, cls in enumerate(HERO_TYPES)}
+HERO_STATES = ["move", "attack", "skill", "dead"]
+ENEMY_STATES = ["move", "attack", "dead"]
+
+COUNT = struct.Struct("<I")
+ANIM = struct.Struct("<Hd?")
+HEADER = struct.Struct("<4sH3?7dBdI")
+LEGACY_HEADER = struct.Struct("<4sH3?7dBd")
+HERO = struct.Struct("<B4d2?B5d?2d")
+ENEMY = struct.Struct("<B4d2?d?")
+PROJECTILE = struct.Struct("<9d2iBd")
+TRACKER = struct.Struct("<d2Id")
+SESSION = struct.Struct("<Id")
+AGE = struct.Struct("<d")
+NAME = struct.Struct("<HI")
+RNG = struct.Struct("<B625Id")
+
+def _age(now, t):
+    return NAN if t is None else now - t
+
+def _time(now, age):
+    return None if math.isnan(age) else now - age
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, record, *values):
+        self.parts.append(record.pack(*values))
+
+    def anim(self, now, anim):
+        self.parts.append(ANIM.pack(anim.index, now - anim.last_time, anim.finished))
+
+    def counter(self, counter):
+        self.pack(COUNT, len(counter))
+        for name, count in counter.items():
+            encoded = name.encode()
+            self.pack(NAME, len(encoded), count)
+            self.parts.append(encoded)
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, record):
+        values = record.unpack_from(self.data, self.offset)
+        self.offset += record.size
+        return values
+
+    def anim(self, now, anim):
+        anim.index, age, anim.finished = self.unpack(ANIM)
+        anim.last_time = now - age
+
+    def counter(self, counter):
+        counter.clear()
+        (n,) = self.unpack(COUNT)
+        for _ in range(n):
+            length, count = self.unpack(NAME)
+            counter[self.data[self.offset:self.offset + length].decode()] = count
+            self.offset += length
+
+def _write_hero(w, now, h):
+    skill = h.skill
+    w.pack(
+        HERO, HERO_INDEX[h.name], h.x, h.y, h.health, h.max_health, h.alive, h.is_dying,
+        HERO_STATES.index(h.current_state), h.attack.cooldown, now - h.attack.last_time,
+        _age(now, skill.last_used_time if skill else None), now - h.skill_anim_start_time,
+        h.skill_anim_duration, h.skill_completed,
+        _age(now, getattr(h, "buff_end_time", None)), getattr(h, "original_cooldown", NAN)
+    )
+    for state in HERO_STATES:
+        w.anim(now, h.animations[state])
+    w.anim(now, h.dead_anim)
+
+def _read_hero(r, now, game):
+    (kind, x, y, health, max_health, alive, is_dying, state, cooldown, attack_age,
+     skill_age, skill_anim_age, skill_anim_duration, skill_completed,
+     buff_age, original_cooldown) = r.unpack(HERO)
+    h = HERO_TYPES[kind](game.hero_sprites)
+    h.x, h.y, h.health, h.max_health = x, y, health, max_health
+    h.alive, h.is_dying = alive, is_dying
+    h.current_state = HERO_STATES[state]
+    h.attack.cooldown = cooldown
+    h.attack.last_time = now - attack_age
+    if h.skill:
+        h.skill.last_used_time = _time(now, skill_age)
+    h.skill_anim_start_time = now - skill_anim_age
+    h.skill_anim_duration = skill_anim_duration
+    h.skill_completed = skill_completed
+    if not math.isnan(buff_age):
+        h.buff_end_time = now - buff_age
+    if not math.isnan(original_cooldown):
+        h.original_cooldown = original_cooldown
+    for state in HERO_STATES:
+        r.anim(now, h.animations[state])
+    r.anim(now, h.dead_anim)
+    return h
+
+def _enemy_kind(game, e):
+    if isinstance(e, BaseTarget):
+        return BASE_KIND
+    frames = e.animations["move"].frames
+    for i, anims in enumerate(game.enemy_sprites.values()):
+        if anims["move"] is frames:
+            return i
+    raise ValueError("enemy uses sprites that are not in game.enemy_sprites")
+
+def _write_enemy(w, now, game, e):
+    kind = _enemy_kind(game, e)
+    w.pack(
+        ENEMY, kind, e.x, e.y, e.health, e.max_health, e.alive, e.is_dying,
+        now - e.attack.last_time if kind != BASE_KIND else 0.0, getattr(e, "_death_logged", False)
+    )
+    if kind != BASE_KIND:
+        for state in ENEMY_STATES:
+            w.anim(now, e.animations[state])
+        w.anim(now, e.dead_anim)
+
+def _read_enemy(r, now, game):
+    kind, x, y, health, max_health, alive, is_dying, attack_age, death_logged = r.unpack(ENEMY)
+    if kind == BASE_KIND:
+        e = game.enemy_base_target
+    else:
+        e = Enemy(list(game.enemy_sprites.values())[kind])
+        e.attack.last_time = now - attack_age
+        for state in ENEMY_STATES:
+            r.anim(now, e.animations[state])
+        r.anim(now, e.dead_anim)
+    e.x, e.y, e.health, e.max_health = x, y, health, max_health
+    e.alive, e.is_dying = alive, is_dying
+    if death_logged:
+        e._death_logged = True
+    return e
+
+def save_battle(game):
+    now = clock.now()
+    w = _Writer()
+    res = game.res_mgr
+    w.pack(
+        HEADER, MAGIC, game.stage, game.paused, game.running, game.was_forced_quit,
+        game.player_base.health, game.enemy_base.health,
+        _age(now, getattr(game, "last_spawn_time", None)), getattr(game, "spawn_interval", NAN),
+        res.energy, res.max_energy, res.regen_rate, res.upgrade_clicks, now - res.last_upgrade_display_time,
+        game.world_width
+    )
+
+    w.pack(COUNT, len(game.hero_buttons))
+    for b in game.hero_buttons:
+        w.pack(AGE, now - b.last)
+    w.pack(AGE, now - game.upgrade_button.last_upgrade_time)
+    w.pack(AGE, now - game.upgrade_button.last_fail_time)
+
+    t = game.tracker
+    w.pack(TRACKER, t.energy_spent, t.enemies_defeated, t.heroes_defeated, now - t.last_snapshot_time)
+    w.counter(t.hero_spawn_counter)
+    w.counter(t.ability_usage_counter)
+
+    version, state, gauss = random.getstate()
+    w.pack(RNG, version, *state, NAN if gauss is None else gauss)
+
+    heroes = game.heroes + game.dying_heroes
+    w.pack(COUNT, len(game.heroes))
+    w.pack(COUNT, len(game.dying_heroes))
+    for h in heroes:
+        _write_hero(w, now, h)
+
+    w.pack(COUNT, len(game.enemies))
+    for e in game.enemies:
+        _write_enemy(w, now, game, e)
+
+    hero_index = {id(h): i for i, h in enumerate(heroes)}
+    enemy_index = {id(e): i for i, e in enumerate(game.enemies)}
+    w.pack(COUNT, len(game.projectiles))
+    for p in game.projectiles:
+        owner, target = p.owner, p.target
+        w.pack(
+            PROJECTILE, p.x, p.y, p.start_x, p.start_y, p.target_x, p.target_y, p.speed, p.damage, p.max_range,
+            hero_index.get(id(owner), -1), enemy_index.get(id(target), -1),
+            HERO_INDEX[owner.name], owner.x
+        )
+
+    # appended last so snapshots written before it still load, with the session starting over
+    w.pack(SESSION, game.ticks, now - t.session_start)
+    w.counter(t.session_totals)
+    return w.getvalue()
+
+def load_battle(game, data):
+    now = clock.now()
+    r = _Reader(data)
+    if data[:4] == LEGACY_MAGIC:
+        # BHS1 predates wide battlefields, its battle was always one screen wide
+        header = r.unpack(LEGACY_HEADER) + (ScreenManager.WIDTH,)
+    elif data[:4] == MAGIC:
+        header = r.unpack(HEADER)
+    else:
+        raise ValueError("not a battle snapshot")
+    (_, stage, paused, running, forced, player_hp, enemy_hp, spawn_age, spawn_interval,
+     energy, max_energy, regen_rate, clicks, upgrade_age, world_width) = header
+    game.set_world_width(world_width)
+    game.stage, game.paused, game.running, game.was_forced_quit = stage, paused, running, forced
+    game.player_base.health = player_hp
+    game.enemy_base.health = enemy_hp
+    if not math.isnan(spawn_age):
+        game.last_spawn_time = now - spawn_age
+        game.spawn_interval = spawn_interval
+    res = game.res_mgr
+    res.energy, res.max_energy, res.regen_rate = energy, max_energy, regen_rate
+    res.upgrade_clicks = clicks
+    res.last_upgrade_display_time = now - upgrade_age
+
+    (n,) = r.unpack(COUNT)
+    for b in game.hero_buttons[:n]:
+        b.last = now - r.unpack(AGE)[0]
+    game.upgrade_button.last_upgrade_time = now - r.unpack(AGE)[0]
+    game.upgrade_button.last_fail_time = now - r.unpack(AGE)[0]
+
+    t = game.tracker
+    t.energy_spent, t.enemies_defeated, t.heroes_defeated, snapshot_age = r.unpack(TRACKER)
+    t.last_snapshot_time = now - snapshot_age
+    r.counter(t.hero_spawn_counter)
+    r.counter(t.ability_usage_counter)
+
+    rng = r.unpack(RNG)
+    random.setstate((rng[0], tuple(rng[1:626]), None if math.isnan(rng[626]) else rng[626]))
+
+    (alive_count,) = r.unpack(COUNT)
+    (dying_count,) = r.unpack(COUNT)
+    heroes = [_read_hero(r, now, game) for _ in range(alive_count + dying_count)]
+    game.heroes = heroes[:alive_count]
+    game.dying_heroes = heroes[alive_count:]
+
+    (n,) = r.unpack(COUNT)
+    game.enemies = [_read_enemy(r, now, game) for _ in range(n)]
+
+    (n,) = r.unpack(COUNT)
+    game.projectiles = []
+    for _ in range(n):
+        (x, y, start_x, start_y, target_x, target_y, speed, damage, max_range,
+         owner_i, target_i, owner_kind, owner_x) = r.unpack(PROJECTILE)
+        if owner_i >= 0:
+            owner = heroes[owner_i]
+        else:
+            owner = HERO_TYPES[owner_kind](game.hero_sprites)
+            owner.x = owner_x
+        target = game.enemies[target_i] if target_i >= 0 else None
+        p = owner.skill_projectile(start_x, start_y, target_x, target_y, target)
+        p.x, p.y, p.speed, p.damage, p.max_range = x, y, speed, damage, max_range
+        game.projectiles.append(p)
+
+    if r.offset < len(data):
+        game.ticks, session_age = r.unpack(SESSION)
+        t.session_start = now - session_age
+        r.counter(t.session_totals)
+    return game
+
+def write_checkpoint(game, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(save_battle(game))
+    os.replace(tmp_path, path)
+
+def read_checkpoint(game, path):
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return load_battle(game, data)
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"corrupt battle snapshot: {e}") from e
@@ -0,0 +1,58 @@
+from array import array
+
+class TickTelemetry:
+    METRICS = ("hero_count", "enemy_count", "energy", "damage_dealt", "frame_time")
+
+    def __init__(self, capacity=3600):
+        self.capacity = capacity
+        self.hero_count = array("d", bytes(8 * capacity))
+        self.enemy_count = array("d", bytes(8 * capacity))
+        self.energy = array("d", bytes(8 * capacity))
+        self.damage_dealt = array("d", bytes(8 * capacity))
+        self.frame_time = array("d", bytes(8 * capacity))
+        self.head = 0
+        self.total = 0
+        self.flushed_total = 0
+        self.pending_damage = 0.0
+
+    def add_damage(self, amount):
+        self.pending_damage += amount
+
+    def record(self, hero_count, enemy_count, energy, frame_time):
+        i = self.head
+        self.hero_count[i] = hero_count
+        self.enemy_count[i] = enemy_count
+        self.energy[i] = energy
+        self.damage_dealt[i] = self.pending_damage
+        self.frame_time[i] = frame_time
+        self.pending_damage = 0.0
+        self.head = i + 1 if i + 1 < self.capacity else 0
+        self.total += 1
+
+    def recent(self, metric, n=None):
+        n = min(self.total, self.capacity) if n is None else min(n, self.total, self.capacity)
+        buf = getattr(self, metric)
+        start = self.head - n
+        if start >= 0:
+            return buf[start:self.head]
+        return buf[start:] + buf[:self.head]
+
+    def summarize(self):
+        # the ring only holds capacity samples, so that is all a long interval can summarize
+        n = min(self.total - self.flushed_total, self.capacity)
+        self.flushed_total = self.total
+        row = [n]
+        for metric in self.METRICS:
+            values = self.recent(metric, n)
+            if values:
+                row += [sum(values) / len(values), max(values)]
+            else:
+                row += [0.0, 0.0]
+        return row
+
+    @classmethod
+    def header(cls):
+        columns = ["Timestamp", "Ticks"]
+        for metric in cls.METRICS:
+            columns += [f"{metric}_mean", f"{metric}_max"]
+        return columns
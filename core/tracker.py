@@ -1,13 +1,38 @@
 import os
 import csv
-import time
+from core.clock import clock
 from collections import defaultdict
+from core.events import HeroSpawned, UnitDied, SkillCast, EnergySpent, Damage, Heal
+from core.combatlog import CombatLog
+from core.telemetry import TickTelemetry
 
 class Tracker:
-    def __init__(self, csv_filename="game_data.csv"):
+    EVENT_TYPES = (HeroSpawned, UnitDied, SkillCast, EnergySpent)
+    SNAPSHOT_INTERVAL = 5
+    HIGH_RES = False
+    COMBAT_LOG = 0.0
+    SESSION_HEROES = ("Archer", "Warrior", "Mage", "Healer")
+    SESSION_SKILLS = ("Buff", "AOE", "Group Heal")
+
+    def __init__(self, csv_filename="game_data.csv", snapshot_interval=None, high_res=None):
         self.csv_filename = csv_filename
+        self.snapshot_interval = snapshot_interval or self.SNAPSHOT_INTERVAL
         self.snapshot_data = []
-        self.last_snapshot_time = time.time()
+        self.last_snapshot_time = clock.now()
+
+        self.high_res = self.HIGH_RES if high_res is None else high_res
+        self.telemetry = TickTelemetry() if self.high_res else None
+        self.tick_csv_filename = csv_filename.replace(".csv", "_ticks.csv")
+        self.tick_rows = []
+        self.sessions_filename = csv_filename.replace(".csv", "_sessions.csv")
+        self.session_rows = []
+        self.session_start = clock.now()
+        self.session_totals = defaultdict(int)
+        self.event_types = self.EVENT_TYPES + (Damage,) if self.high_res else self.EVENT_TYPES
+        # COMBAT_LOG is the fraction of damage/heal events kept; 0 disables the log
+        self.combat_log = CombatLog(csv_filename.replace(".csv", "_combat.bin"), self.COMBAT_LOG) if self.COMBAT_LOG else None
+        if self.combat_log:
+            self.event_types = tuple(dict.fromkeys(self.event_types + (Damage, Heal)))
 
         self.enemies_defeated = 0
         self.hero_spawn_counter = defaultdict(int)
@@ -29,22 +54,70 @@ class Tracker:
 
     def log_hero_defeated(self):
         self.heroes_defeated += 1
+        self.session_totals["heroes_defeated"] += 1
 
     def log_hero_spawn_count(self, hero_name):
         self.hero_spawn_counter[hero_name] += 1
+        self.session_totals[hero_name] += 1
 
     def log_ability_used(self, skill_name):
         self.ability_usage_counter[skill_name] += 1
+        self.session_totals[skill_name] += 1
 
     def log_enemy_defeated(self):
         self.enemies_defeated += 1
+        self.session_totals["enemies_defeated"] += 1
 
     def log_energy_spent(self, amount):
         self.energy_spent += amount
+        self.session_totals["energy_spent"] += amount
+
+    def log_session(self, stage, result, ticks):
+        now = clock.now()
+        totals = self.session_totals
+        self.session_rows.append(
+            [now, stage, result, ticks, round(now - self.session_start, 3),
+             totals["energy_spent"], totals["enemies_defeated"], totals["heroes_defeated"]]
+            + [totals[name] for name in self.SESSION_HEROES]
+            + [totals[name] for name in self.SESSION_SKILLS]
+        )
+        self.session_totals = defaultdict(int)
+        self.session_start = now
+        if self.combat_log:
+            self.combat_log.end_session(now)
+
+    @classmethod
+    def session_header(cls):
+        return (["Timestamp", "Stage", "Result", "Ticks", "DurationSec", "EnergySpent", "EnemiesDefeated", "HeroesDefeated"]
+                + [f"Spawned_{name}" for name in cls.SESSION_HEROES]
+                + [f"Used_{name.replace(' ', '')}" for name in cls.SESSION_SKILLS])
+
+    def on_events(self, batch):
+        if self.combat_log:
+            self.combat_log.on_events(batch)
+        for e in batch:
+            kind = type(e)
+            if kind is HeroSpawned:
+                self.log_hero_spawn_count(e.name)
+            elif kind is UnitDied:
+                if e.side == "hero":
+                    self.log_hero_defeated()
+                else:
+                    self.log_enemy_defeated()
+            elif kind is SkillCast:
+                self.log_ability_used(e.skill)
+            elif kind is EnergySpent:
+                self.log_energy_spent(e.amount)
+            elif kind is Damage and self.telemetry and e.source != "Enemy":
+                self.telemetry.add_damage(e.amount)
+
+    def record_tick(self, hero_count, enemy_count, energy, frame_time):
+        if self.telemetry:
+            self.telemetry.record(hero_count, enemy_count, energy, frame_time)
 
     def try_snapshot(self):
-        now = time.time()
-        if now - self.last_snapshot_time >= 5:
+        now = clock.now()
+        if now - self.last_snapshot_time >= self.snapshot_interval:
             most_spawned = max(self.hero_spawn_counter.items(), key=lambda x: x[1], default=("None", 0))
             archer_count = self.ability_usage_counter.get("Buff", 0)
             mage_count = self.ability_usage_counter.get("AOE", 0)
@@ -61,6 +134,8 @@ class Tracker:
                 mage_count,
                 healer_count
             ])
+            if self.telemetry:
+                self.tick_rows.append([now] + self.telemetry.summarize())
             self.heroes_defeated = 0
             self.enemies_defeated = 0
             self.hero_spawn_counter.clear()
@@ -68,6 +143,27 @@ class Tracker:
             self.last_snapshot_time = now
 
     def append_new_rows(self):
+        if self.combat_log:
+            self.combat_log.flush()
+
+        if self.session_rows:
+            write_header = not os.path.exists(self.sessions_filename)
+            with open(self.sessions_filename, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(self.session_header())
+                writer.writerows(self.session_rows)
+            self.session_rows.clear()
+
+        if self.tick_rows:
+            write_header = not os.path.exists(self.tick_csv_filename)
+            with open(self.tick_csv_filename, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(TickTelemetry.header())
+                writer.writerows(self.tick_rows)
+            self.tick_rows.clear()
+
         if not self.snapshot_data:
             return
 
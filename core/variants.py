@@ -0,0 +1,174 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+import pygame
+from core.animation import AnimationManager, png_bytes, textures
+
+MANIFEST = "assets/Enemy/variants.json"
+_cache = {}
+
+def parse_color(value):
+    return pygame.Color("#" + value)
+
+def hue_shift(color, degrees):
+    shifted = pygame.Color(color)
+    h, s, v, a = shifted.hsva
+    shifted.hsva = ((h + degrees) % 360, s, v, a)
+    return shifted
+
+def read_manifest(path=MANIFEST):
+    with open(path) as f:
+        return json.load(f)
+
+def state_paths(enemy_type):
+    return {state: os.path.join(enemy_type["folder"], strip + ".png") for state, strip in enemy_type["states"].items()}
+
+def recolor_strip(frames, mapping=None, tint=None):
+    sheet = frames[0].get_parent().copy()
+    if mapping:
+        pixels = pygame.PixelArray(sheet)
+        for src, dst in mapping:
+            pixels.replace(src, dst)
+        pixels.close()
+    if tint is not None:
+        sheet.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+    return [sheet.subsurface(pygame.Rect(f.get_offset(), f.get_size())) for f in frames]
+
+def variant_mapping(palette, spec):
+    if "palette" in spec:
+        targets = [parse_color(c) for c in spec["palette"]]
+    elif "hue" in spec:
+        targets = [hue_shift(c, spec["hue"]) for c in palette]
+    else:
+        return None
+    return [(src, dst) for src, dst in zip(palette, targets) if src != dst]
+
+def build_variants(manifest):
+    sprites = {}
+    for enemy_type in manifest.values():
+        base = {state: AnimationManager.load_sprite_strip(path) for state, path in state_paths(enemy_type).items()}
+        prepared = {}
+        palette = [parse_color(c) for c in enemy_type.get("palette", [])]
+        for name, spec in enemy_type["variants"].items():
+            mapping = variant_mapping(palette, spec)
+            tint = parse_color(spec["tint"]) if "tint" in spec else None
+            if not mapping and tint is None:
+                if not prepared:
+                    prepared = {state: AnimationManager.prepare_strip(frames) for state, frames in base.items()}
+                sprites[name] = dict(prepared)
+            else:
+                # recolour whole sheets, then trim and encode the result like any other strip
+                sprites[name] = {state: AnimationManager.prepare_strip(recolor_strip(frames, mapping, tint))
+                                 for state, frames in base.items()}
+    return sprites
+
+def load_enemy_variants(path=MANIFEST):
+    sprites = _cache.get(path)
+    if sprites is None:
+        start = time.perf_counter()
+        sprites = _cache[path] = build_variants(read_manifest(path))
+        register_variants(sprites, textures, time.perf_counter() - start)
+    return sprites
+
+def register_variants(sprites, budget, elapsed=0):
+    for name, anims in sprites.items():
+        budget.pin(name, sheet_bytes({name: anims}), elapsed / len(sprites))
+
+def sheet_bytes(sprites):
+    surfaces = {}
+    for anims in sprites.values():
+        for frames in anims.values():
+            for frame in frames:
+                surface = frame.get_abs_parent()
+                surfaces[id(surface)] = surface.get_pitch() * surface.get_height()
+    return sum(surfaces.values())
+
+def report(path=MANIFEST):
+    manifest = read_manifest(path)
+    start = time.perf_counter()
+    sprites = build_variants(manifest)
+    elapsed = time.perf_counter() - start
+    folders = [spec["source"] for enemy_type in manifest.values() for spec in enemy_type["variants"].values()
+               if os.path.isdir(spec.get("source", ""))]
+    start = time.perf_counter()
+    for folder in folders:
+        AnimationManager.load_animations_from_folder(folder)
+    legacy_elapsed = time.perf_counter() - start
+    legacy = sum(png_bytes(os.path.join(folder, f)) for folder in folders for f in os.listdir(folder) if f.endswith(".png"))
+    loaded = sheet_bytes(sprites)
+    return {
+        "variants": len(sprites),
+        "build_ms": round(1000 * elapsed, 2),
+        "legacy_ms": round(1000 * legacy_elapsed, 2),
+        "surface_bytes": loaded,
+        "legacy_bytes": legacy,
+        "saved_bytes": legacy - loaded,
+    }
+
+def rgba_pixels(surface):
+    data = pygame.image.tobytes(surface, "RGBA")
+    return [data[i:i + 4] for i in range(0, len(data), 4)]
+
+def extract_palette(base_frames, variant_frames):
+    votes = defaultdict(Counter)
+    for base_strip, variant_strip in zip(base_frames, variant_frames):
+        for src, dst in zip(rgba_pixels(base_strip), rgba_pixels(variant_strip)):
+            if src[3] == 255:
+                votes[src[:3]][dst[:3]] += 1
+    # most frequent source colours first; each maps to the colour it became most often
+    ordered = sorted(votes, key=lambda c: -sum(votes[c].values()))
+    return [c.hex() for c in ordered], [votes[c].most_common(1)[0][0].hex() for c in ordered]
+
+def extract(name, base_folder, variant_folders, states):
+    def strips(folder):
+        return [AnimationManager.load_sprite_strip(os.path.join(folder, strip + ".png"))[0].get_parent() for strip in states.values()]
+    base = strips(base_folder)
+    enemy_type = {"folder": base_folder, "states": states, "palette": None, "variants": {}}
+    for folder in variant_folders:
+        palette, targets = extract_palette(base, strips(folder))
+        enemy_type["palette"] = enemy_type["palette"] or palette
+        variant = {"source": folder}
+        if folder != base_folder:
+            lookup = dict(zip(palette, targets))
+            variant["palette"] = [lookup.get(c, c) for c in enemy_type["palette"]]
+        enemy_type["variants"][os.path.basename(folder)] = variant
+    return {name: enemy_type}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enemy colour variants generated from one base sprite set")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ext = sub.add_parser("extract", help="derive palettes by comparing recoloured sprite folders with the base folder")
+    ext.add_argument("name")
+    ext.add_argument("base")
+    ext.add_argument("variants", nargs="+")
+    ext.add_argument("--states", default="move=Run,attack=Attack_1,dead=Dead")
+    ext.add_argument("-o", "--output", default=MANIFEST)
+    rep = sub.add_parser("report", help="build every variant and report surface memory against per-folder loading")
+    rep.add_argument("manifest", nargs="?", default=MANIFEST)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    if args.command == "extract":
+        states = dict(item.split("=") for item in args.states.split(","))
+        manifest = read_manifest(args.output) if os.path.exists(args.output) else {}
+        manifest.update(extract(args.name, args.base, args.variants, states))
+        # one line per colour list keeps the manifest reviewable
+        text = re.sub(r"\[\s+([^\[\]{}]*?)\s+\]", lambda m: "[" + " ".join(m.group(1).split()) + "]", json.dumps(manifest, indent=1))
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        result = report(args.manifest)
+        print(f"{result['variants']} variants built in {result['build_ms']} ms "
+              f"(decoding every variant folder: {result['legacy_ms']} ms)")
+        print(f"surfaces {result['surface_bytes'] / 1024:.0f} KiB vs {result['legacy_bytes'] / 1024:.0f} KiB "
+              f"decoding every variant folder (saved {result['saved_bytes'] / 1024:.0f} KiB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
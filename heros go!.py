@@ -1,62 +1,46 @@
 from core.screen import ScreenManager
 from ui.menu import MainMenu, EndScreen
-from settings.settings_window import SettingsWindow
+from settings.settings_window import SettingsChannel
 from units.base import Base, BaseTarget
 from units.hero import Archer, Warrior, Mage, Healer
 from units.enemy import Enemy
-from core.animation import AnimationManager
+from core.animation import textures
+from core.variants import load_enemy_variants
+from core.culling import CullingManager
+from core.camera import Camera
+from core.background import ChunkedBackground
 from core.tracker import Tracker
 from core.resource import ResourceManager
+from core.snapshot import write_checkpoint, read_checkpoint
+from core.clock import clock
+from core.events import events, HeroSpawned, UnitDied
+from combat.resolution import CombatResolver
+from core.policy import POLICIES, observe, apply_action
+from core.memprof import MemoryProfiler
+from core.broadcast import StateBroadcaster, HERO_KIND, ENEMY_KIND_OFFSET, DYING
+from core.simprocess import SimulationProcess
+from core.render import RenderQueue, PROJECTILES, BADGES
 from ui.button import HeroButton, UpgradeButton, Button
+from ui.hud import HUD, UNIT_HEALTH_BAR, SKILL_MARKER
 import pygame
-import tkinter as tk
 import time
 import random
+import os
+import sys
+import argparse
 
-class GameManager:
-    def __init__(self):
-        self.screen_mgr = ScreenManager()
-        self.tracker = Tracker()
+class BattleView:
+    BACKGROUND = "assets/Background/Stage1.png"
+
+    def build_world(self):
         self.player_base = Base(10, ScreenManager.GREEN, "assets/Base/Base1.png", scale_factor=6)
-        self.enemy_base = Base(ScreenManager.WIDTH - 60, ScreenManager.RED, "assets/Base/Base2.png", scale_factor=3)
-        self.heroes = []
-        self.enemies = []
-        self.projectiles = []
-        self.dying_heroes = []
-        self.dying_enemies = []
-        self.enemy_base_target = BaseTarget(self.enemy_base)
-        self.enemies.append(self.enemy_base_target)
-        self.res_mgr = ResourceManager()
-        self.tk_root = tk.Tk()
-        self.tk_root.withdraw()
-        self.settings = SettingsWindow(self, self.tk_root)
-
-        blue = AnimationManager.load_animations_from_folder("assets/Enemy/Blue_Slime")
-        green = AnimationManager.load_animations_from_folder("assets/Enemy/Green_Slime")
-        red = AnimationManager.load_animations_from_folder("assets/Enemy/Red_Slime")
-
-        self.enemy_sprites = {
-            "Blue_Slime": {"move": blue.get("run", []), "attack": blue.get("attack_1", []), "dead": blue.get("dead", [])},
-            "Green_Slime": {"move": green.get("run", []), "attack": green.get("attack_1", []), "dead": green.get("dead", [])},
-            "Red_Slime": {"move": red.get("run", []), "attack": red.get("attack_1", []), "dead": red.get("dead", [])},
-        }
-
-        fighter = AnimationManager.load_animations_from_folder("assets/Fighter")
-        archer = AnimationManager.load_animations_from_folder("assets/Samurai")
-        mage = AnimationManager.load_animations_from_folder("assets/Mage")
-        healer = AnimationManager.load_animations_from_folder("assets/Healer")
-
-        bg = pygame.image.load("assets/Background/Stage1.png").convert()
-        cropped = bg.subsurface(pygame.Rect(0, 0, bg.get_width(), bg.get_height() - 50))
-        self.background = pygame.transform.scale(cropped, (ScreenManager.WIDTH, ScreenManager.HEIGHT))
-
-        self.hero_sprites = {
-            "Archer": {"move": archer["run"], "attack": archer["attack_2"], "skill": archer["idle"], "dead": archer["dead"]},
-            "Warrior": {"move": fighter["run"], "attack": fighter["attack_2"], "skill": fighter["idle"], "dead": fighter["dead"]},
-            "Mage": {"move": mage["walk"], "attack": mage["attack_1"], "skill": mage["attack_2"], "dead": mage["dead"]},
-            "Healer": {"move": healer["walk"], "attack": healer["attack_4"], "skill": healer["scream"], "dead": healer["dead"]},
-        }
+        self.enemy_base = Base(self.world_width - 60, ScreenManager.RED, "assets/Base/Base2.png", scale_factor=3)
+        self.background = ChunkedBackground(self.BACKGROUND, self.world_width)
+        self.camera = Camera(self.world_width)
+        self.culling = CullingManager(self.camera.view)
+        self.render_queue = RenderQueue()
 
+    def build_ui(self):
         self.hero_buttons = [
             HeroButton(100, Archer, 20, 3),
             HeroButton(190, Warrior, 10, 2),
@@ -67,9 +51,61 @@ class GameManager:
         self.upgrade_button = UpgradeButton(520, ScreenManager.HEIGHT - 70, width=160)
         self.settings_button = Button(
             rect=(ScreenManager.WIDTH - 120, 10, 100, 40),
-            label="Settings", on_click=lambda: self.settings.run(),
+            label="Settings", on_click=lambda: self.settings.run(self.paused),
             color=(200, 200, 200), font_size=20
         )
+        self.hud = HUD()
+
+    def set_world_width(self, width):
+        if width == self.world_width:
+            return
+        self.world_width = width
+        self.enemy_base.x = width - 60
+        self.background = ChunkedBackground(self.background.image_path, width)
+        self.camera.world_width = width
+        self.camera.move_to(self.camera.x)
+
+    def draw_overlay(self, surface):
+        for btn in self.hero_buttons:
+            btn.draw(surface, self.res_mgr)
+
+        self.hud.draw(surface, self.res_mgr, self.stage)
+        if self.camera.is_scrollable():
+            self.hud.draw_scrollbar(surface, self.camera)
+        self.settings_button.draw(surface)
+
+class GameManager(BattleView):
+    CHECKPOINT_PATH = "battle_checkpoint.bin"
+    CHECKPOINT_INTERVAL = 10
+    WORLD_WIDTH = ScreenManager.WIDTH
+    bus_tracker = None
+
+    def __init__(self, settings=None, world_width=None):
+        self.screen_mgr = ScreenManager()
+        self.world_width = max(world_width or self.WORLD_WIDTH, ScreenManager.WIDTH)
+        self.tracker = Tracker()
+        events.reset()
+        # the bus is process-wide: swap out only the previous battle's tracker, other subscribers stay
+        events.unsubscribe(GameManager.bus_tracker)
+        GameManager.bus_tracker = self.tracker
+        events.subscribe(self.tracker, self.tracker.event_types)
+        self.resolver = CombatResolver()
+        self.build_world()
+        self.heroes = []
+        self.enemies = []
+        self.projectiles = []
+        self.dying_heroes = []
+        self.dying_enemies = []
+        self.enemy_base_target = BaseTarget(self.enemy_base)
+        self.enemies.append(self.enemy_base_target)
+        self.player_base_target = BaseTarget(self.player_base, "Base")
+        self.res_mgr = ResourceManager()
+        self.settings = settings if settings is not None else SettingsChannel()
+
+        self.enemy_sprites = load_enemy_variants()
+
+        self.hero_sprites = textures.animation_sets()
+        self.build_ui()
 
         self.paused = False
         self.running = True
@@ -77,15 +113,77 @@ class GameManager:
         
         self.stage = 1
         self.enemy_hp_scale = {1: 100, 2: 200, 3: 300, 4: 400, 5: 500}
+        self.last_checkpoint_time = time.time()
+        self.ticks = 0
+        self.last_tick_time = time.perf_counter()
 
 
     def create_hero(self, cls):
         hero = cls(self.hero_sprites)
-        self.tracker.log_hero_spawn_count(hero.name)
+        events.emit(HeroSpawned, hero.name)
         return hero
 
+    def set_world_width(self, width):
+        super().set_world_width(width)
+        self.enemy_base_target.x = self.enemy_base.x - 20
+
+    def handle_click(self, pos):
+        for b in self.hero_buttons:
+            if b.rect.collidepoint(pos):
+                b.try_spawn(self)
+        self.upgrade_button.try_click(pos, self.res_mgr)
+
+    def handle_settings_command(self, command):
+        if command == "pause":
+            self.paused = True
+        elif command == "resume":
+            self.paused = False
+            # the pause is not a frame, don't let it land in the next frame_time sample
+            self.last_tick_time = time.perf_counter()
+        elif command == "end_battle":
+            self.save_checkpoint()
+            self.running = False
+            self.was_forced_quit = True
+        elif command == "open_stats":
+            self.settings.open_analytics()
+
+    def result(self):
+        if self.was_forced_quit:
+            return "quit"
+        if self.enemy_base.health <= 0:
+            return "win"
+        return "loss" if self.player_base.health <= 0 else "timeout"
+
+    def step_policy(self, policy):
+        for action in policy.act(observe(self)):
+            apply_action(self, action)
+
+    def save_checkpoint(self):
+        write_checkpoint(self, self.CHECKPOINT_PATH)
+        self.last_checkpoint_time = time.time()
+
+    def load_checkpoint(self):
+        try:
+            read_checkpoint(self, self.CHECKPOINT_PATH)
+        except ValueError:
+            # an interrupted write or a foreign file, it can never load so drop it
+            self.clear_checkpoint()
+            return False
+        self.paused = False
+        self.last_checkpoint_time = time.time()
+        return True
+
+    def try_checkpoint(self):
+        if time.time() - self.last_checkpoint_time >= self.CHECKPOINT_INTERVAL:
+            self.save_checkpoint()
+
+    @classmethod
+    def clear_checkpoint(cls):
+        if os.path.exists(cls.CHECKPOINT_PATH):
+            os.remove(cls.CHECKPOINT_PATH)
+
     def spawn_enemy(self):
-        now = time.time()
+        now = clock.now()
         if not hasattr(self, 'last_spawn_time'):
             self.last_spawn_time = now
         if not hasattr(self, 'spawn_interval'):
@@ -94,7 +192,7 @@ class GameManager:
         if now - self.last_spawn_time >= self.spawn_interval:
             choice = random.choice(list(self.enemy_sprites.keys()))
             anims = self.enemy_sprites[choice]
-            enemy = Enemy(anims)
+            enemy = Enemy(anims, self.world_width - 50)
             enemy.health = enemy.max_health = self.enemy_hp_scale.get(self.stage, 200)
             self.enemies.append(enemy)
             self.last_spawn_time = now
@@ -103,19 +201,30 @@ class GameManager:
     def update(self):
         if self.paused:
             return
+        self.ticks += 1
         for h in self.heroes[:]:
             h.update(self.enemies, self.heroes, self)
 
-        for e in self.enemies[:]:
-            e.update(self.heroes)
+        for e in self.enemies:
+            e.update(self.heroes, self.resolver)
+
+        for proj in self.projectiles:
+            proj.update()
+        self.projectiles = [p for p in self.projectiles if p.alive]
+
+        for e in self.enemies:
+            if e.alive and e.x <= 50:
+                # reaching the base costs the enemy its life and lands as a hit in this tick's resolution
+                self.resolver.damage(e, self.player_base_target, 5)
+                e.die()
+
+        self.resolver.resolve()
+
+        for e in self.enemies:
             if not e.alive and not getattr(e, '_death_logged', False):
                 if not isinstance(e, BaseTarget):
-                    self.tracker.log_enemy_defeated()
+                    events.emit(UnitDied, "enemy", "Enemy")
                 e._death_logged = True
-            elif e.x <= 50 and not e.is_dying:
-                self.player_base.health -= 5
-                e.alive = False
-                e.is_dying = True
 
         for e in self.enemies[:]:
             if e.is_dying:
@@ -123,13 +232,9 @@ class GameManager:
                 if e.dead_anim.finished:
                     self.enemies.remove(e)
 
-        for proj in self.projectiles:
-            proj.update()
-        self.projectiles = [p for p in self.projectiles if p.alive]
-
         for h in self.heroes[:]:
             if h.is_dying:
-                self.tracker.log_hero_defeated()
+                events.emit(UnitDied, "hero", h.name)
                 self.dying_heroes.append(h)
                 self.heroes.remove(h)
 
@@ -139,6 +244,12 @@ class GameManager:
                 self.dying_heroes.remove(h)
 
         self.res_mgr.regenerate()
+        events.flush()
+
+        if self.tracker.telemetry:
+            now = time.perf_counter()
+            self.tracker.record_tick(len(self.heroes), len(self.enemies) - 1, self.res_mgr.energy, now - self.last_tick_time)
+            self.last_tick_time = now
 
         if self.player_base.health <= 0:
             self.running = False
@@ -147,96 +258,283 @@ class GameManager:
 
         self.tracker.try_snapshot()
 
+    def advance_animations(self):
+        # draw() advances the animations of the units it draws; a headless simulation process does it here instead
+        for unit in self.heroes + self.enemies:
+            if unit.alive:
+                unit.update_animation()
+
+    def finish(self, result=None):
+        result = result or self.result()
+        self.tracker.log_session(self.stage, result, self.ticks)
+        self.tracker.append_new_rows()
+        if result != "quit":
+            self.clear_checkpoint()
+
     def draw(self):
         sm = self.screen_mgr
-        font = pygame.font.Font(None, 24)
-        sm.surface.blit(self.background, (0, 0))
-        self.player_base.draw(sm.surface)
+        camera_x = self.camera.x
+        self.background.draw(sm.surface, camera_x)
+        if self.culling.view.colliderect(self.player_base.draw_rect()):
+            self.player_base.draw(sm.surface, camera_x)
         self.upgrade_button.draw(sm.surface, self.res_mgr)
 
-        for proj in self.projectiles:
-            proj.draw(sm.surface)
-        for h in self.heroes:
-            h.draw(sm.surface)
-        for e in self.enemies:
-            e.draw(sm.surface)
-        for h in self.dying_heroes:
-            h.draw(sm.surface)
-        for e in self.dying_enemies:
-            e.draw(sm.surface)
-        for btn in self.hero_buttons:
-            btn.draw(sm.surface, self.res_mgr)
+        self.culling.reset_stats()
+        queue = self.render_queue
+        self.culling.submit_projectiles(queue, self.projectiles)
+        self.culling.submit_units(queue, self.heroes)
+        self.culling.submit_units(queue, self.enemies)
+        self.culling.submit_units(queue, self.dying_heroes)
+        self.culling.submit_units(queue, self.dying_enemies)
+        queue.flush(sm.surface)
+        self.draw_overlay(sm.surface)
+        sm.update()
 
-        energy_text = f"Energy: {int(self.res_mgr.energy)} / {int(self.res_mgr.max_energy)}"
-        energy_render = font.render(energy_text, True, ScreenManager.BLACK)
-        sm.surface.blit(energy_render, (10, 10))
-        stage_text = font.render(f"Stage: {self.stage}", True, ScreenManager.BLACK)
-        sm.surface.blit(stage_text, (ScreenManager.WIDTH // 2 - stage_text.get_width() // 2, 10))
-        
-        self.settings_button.draw(sm.surface)
 
-        if time.time() - self.res_mgr.last_upgrade_display_time < 1:
-            plus_text = font.render("+10", True, (0, 200, 0))
-            sm.surface.blit(plus_text, (10 + energy_render.get_width() + 5, 10))
+class RemoteGame(BattleView):
+    STATE_NAMES = ("move", "attack", "skill", "dead")
+    BAR_OFFSETS = (30, 80)
 
-        sm.update()
+    def __init__(self, sim, settings, stage=1, resume=False):
+        self.sim = sim
+        self.screen_mgr = ScreenManager()
+        self.settings = settings
+        self.world_width = max(GameManager.WORLD_WIDTH, ScreenManager.WIDTH)
+        self.stage = stage
+        self.paused = False
+        self.running = True
+        self.was_forced_quit = False
+        self.ticks = 0
+        self.res_mgr = ResourceManager()
+        self.units = []
+        self.projectiles = []
+        hero_sets = textures.animation_sets()
+        self.sprites = {kind: hero_sets[name] for name, kind in HERO_KIND.items()}
+        for i, anims in enumerate(load_enemy_variants().values()):
+            self.sprites[ENEMY_KIND_OFFSET + i] = anims
+        self.projectile_image = pygame.Surface((10, 10))
+        self.projectile_image.fill((255, 100, 0))
+        self.build_world()
+        self.build_ui()
+        self.game_id = sim.start_game(stage, resume)
+
+    def sync(self):
+        snap = self.sim.read()
+        if snap is None or snap.game_id != self.game_id:
+            return
+        self.ticks = snap.tick
+        self.stage = snap.stage
+        self.paused = snap.paused
+        self.running = not snap.over
+        self.was_forced_quit = snap.result == "quit"
+        self.set_world_width(snap.world_width)
+        res = self.res_mgr
+        res.energy, res.max_energy = snap.energy, snap.max_energy
+        res.upgrade_clicks, res.last_upgrade_display_time = snap.upgrade_clicks, snap.upgrade_display_time
+        self.player_base.health = snap.player_base_health
+        self.enemy_base.health = snap.enemy_base_health
+        self.upgrade_button.last_upgrade_time = snap.upgrade_time
+        self.upgrade_button.last_fail_time = snap.upgrade_fail_time
+        for b, last in zip(self.hero_buttons, snap.button_times):
+            b.last = last
+        self.units = snap.units
+        self.projectiles = snap.projectiles
+
+    def handle_click(self, pos):
+        for i, b in enumerate(self.hero_buttons):
+            if b.rect.collidepoint(pos):
+                self.sim.send("spawn", i)
+        if self.upgrade_button.rect.collidepoint(pos):
+            self.sim.send("upgrade")
+
+    def handle_settings_command(self, command):
+        if command == "open_stats":
+            self.settings.open_analytics()
+        else:
+            self.sim.send("settings", command)
+
+    def submit_units(self, queue, camera_x):
+        culling = self.culling
+        right = camera_x + culling.view.width
+        strips = {}
+        visible = []
+        for record in self.units:
+            kind, state, index, health, x, y = record
+            frames = strips.get((kind, state))
+            if frames is None:
+                frames = strips[kind, state] = self.sprites[kind][self.STATE_NAMES[state]]
+            frame = frames[min(index, len(frames) - 1)]
+            left = x + frame.dx
+            if left + frame.get_width() < camera_x or left > right:
+                culling.culled += 1
+                continue
+            visible.append((frame, record))
+
+        lod = culling.lod_threshold is not None and len(visible) > culling.lod_threshold
+        groups = {}
+        now = clock.now()
+        for frame, record in visible:
+            kind, state, index, health, x, y = record
+            if lod:
+                group = groups.get((kind, state, x // culling.lod_cell))
+                if group is not None:
+                    group[1] += 1
+                    continue
+                groups[kind, state, x // culling.lod_cell] = [record, 1]
+            sx = x - camera_x
+            queue.submit(frame, (sx + frame.dx, y + frame.dy))
+            culling.drawn += 1
+            if state == DYING:
+                continue
+            bar_offset = self.BAR_OFFSETS[kind >= ENEMY_KIND_OFFSET]
+            UNIT_HEALTH_BAR.submit(queue, sx - UNIT_HEALTH_BAR.width // 2, y + bar_offset, health / 255)
+            if self.STATE_NAMES[state] == "skill" and kind < ENEMY_KIND_OFFSET:
+                SKILL_MARKER.submit(queue, sx, y - 12, now)
 
+        for (kind, state, index, health, x, y), count in groups.values():
+            if count > 1:
+                queue.submit(culling.badge(count), (x - camera_x + 22, y + self.BAR_OFFSETS[kind >= ENEMY_KIND_OFFSET] - 3), BADGES)
 
-def main():
+    def draw(self):
+        sm = self.screen_mgr
+        camera_x = self.camera.x
+        view = self.culling.view
+        self.background.draw(sm.surface, camera_x)
+        for base in (self.player_base, self.enemy_base):
+            if view.colliderect(base.draw_rect()):
+                base.draw(sm.surface, camera_x)
+        self.upgrade_button.draw(sm.surface, self.res_mgr)
+
+        self.culling.reset_stats()
+        queue = self.render_queue
+        image = self.projectile_image
+        half = image.get_width() // 2
+        for x, y in self.projectiles:
+            if camera_x - half <= x <= view.right + half:
+                queue.submit(image, (x - camera_x - half, y - half), PROJECTILES)
+        self.submit_units(queue, camera_x)
+        queue.flush(sm.surface)
+        self.draw_overlay(sm.surface)
+        sm.update()
+
+def simulate(policy, stage=1, max_ticks=ScreenManager.FPS * 600):
+    clock.use_simulated()
+    try:
+        game = GameManager()
+        game.stage = stage
+        policy.reset()
+        while game.running and game.ticks < max_ticks:
+            game.step_policy(policy)
+            game.spawn_enemy()
+            game.update()
+            clock.advance(1 / ScreenManager.FPS)
+        # headless runs keep the CSVs clean, but an opt-in combat log is written in simulated seconds
+        if game.tracker.combat_log:
+            game.tracker.combat_log.end_session(clock.now())
+            game.tracker.combat_log.flush()
+    finally:
+        clock.use_wall()
+    return game
+
+def main(policy=None, memprofile=False, broadcaster=None, max_frames=None, sim=None):
     screen_mgr = ScreenManager()
-    main_menu = MainMenu(screen_mgr)
+    settings = SettingsChannel()
+    main_menu = MainMenu(screen_mgr, can_resume=os.path.exists(GameManager.CHECKPOINT_PATH))
     game = None
     end_screen = None
     game_state = "menu"
     running = True
-
+    frames = 0
+    profiler = MemoryProfiler() if memprofile else None
+
+    def new_game(stage=1, resume=False):
+        if sim:
+            return RemoteGame(sim, settings, stage, resume)
+        game = GameManager(settings)
+        game.stage = stage
+        if resume and not game.load_checkpoint():
+            # a failed load may have half-applied, start over clean
+            game = GameManager(settings)
+        return game
+
+    def retire(old_game):
+        if profiler and old_game is not None:
+            profiler.expect_game_freed(old_game)
+
+    def report(label):
+        if profiler:
+            print(profiler.format(profiler.checkpoint(label, game)))
+
+    report("menu")
     while running:
-        for event in pygame.event.get():
+        # never block before the first frame, the menu should appear as soon as the window does
+        idle = frames and (game_state != "playing" or game.paused)
+        frame_events = screen_mgr.wait_events() if idle else screen_mgr.get_events()
+        for event in frame_events:
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE and game_state == "playing":
-                    game.settings.run()
+                    settings.run(game.paused)
+            if game_state == "playing":
+                game.camera.handle_event(event)
 
             if game_state == "menu":
                 result = main_menu.handle_event(event)
                 if result == "start":
-                    game = GameManager()
+                    retire(game)
+                    game = new_game()
+                    main_menu.result = None
+                    game_state = "playing"
+                    report("start")
+                elif result == "resume":
+                    retire(game)
+                    game = new_game(resume=True)
                     main_menu.result = None
                     game_state = "playing"
+                    report("resume")
 
             elif game_state == "playing":
-                for b in game.hero_buttons:
-                    if event.type == pygame.MOUSEBUTTONDOWN and b.rect.collidepoint(event.pos):
-                        b.try_spawn(game)
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    game.upgrade_button.try_click(event.pos, game.res_mgr)
+                    game.handle_click(event.pos)
                     game.settings_button.handle_event(event)
 
             elif game_state == "end":
                 result = end_screen.handle_event(event)
                 if result == "restart":
-                    game = GameManager()
-                    game.tracker.snapshot_data.clear()
+                    retire(game)
+                    game = new_game()
                     game_state = "playing"
+                    report("restart")
                 elif result == "home":
-                    main_menu = MainMenu(screen_mgr)
+                    main_menu = MainMenu(screen_mgr, can_resume=os.path.exists(GameManager.CHECKPOINT_PATH))
                     game_state = "menu"
                 elif result == "next_stage":
                     stage = game.stage + 1
-                    game = GameManager()
-                    game.stage = stage
+                    retire(game)
+                    game = new_game(stage)
                     game_state = "playing"
+                    report(f"stage {stage}")
 
         if game_state == "menu":
             main_menu.draw()
         elif game_state == "playing":
-            if not game.paused:
+            game.camera.update(pygame.key.get_pressed(), ScreenManager.mouse_pos() if pygame.mouse.get_focused() else None)
+            if sim:
+                game.sync()
+            elif not game.paused:
+                if policy:
+                    game.step_policy(policy)
                 game.spawn_enemy()
                 game.update()
+                game.try_checkpoint()
+                if broadcaster:
+                    broadcaster.publish(game)
             game.draw()
             if not game.running:
-                game.tracker.append_new_rows()
+                if not sim:
+                    game.finish()
+                settings.close_window()
                 if game.was_forced_quit:
                     end_screen = EndScreen(screen_mgr, is_victory=None)
                 else:
@@ -247,15 +545,73 @@ def main():
             end_screen.draw()
 
         screen_mgr.tick()
-        if game:
-            try:
-                game.tk_root.update()
-            except tk.TclError:
-                pass
-
-    if game:
+        for command in settings.poll():
+            if game:
+                game.handle_settings_command(command)
+        frames += 1
+        if frames == max_frames:
+            running = False
+
+    if sim:
+        sim.stop()
+    elif game:
+        if game_state == "playing":
+            game.tracker.log_session(game.stage, "quit", game.ticks)
         game.tracker.append_new_rows()
+    if broadcaster:
+        broadcaster.stop()
+    settings.stop()
     screen_mgr.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Battle Heroes Defense")
+    parser.add_argument("--policy", choices=sorted(POLICIES), help="let a built-in policy deploy heroes")
+    parser.add_argument("--simulate", type=int, metavar="RUNS", help="run RUNS headless battles with --policy and exit")
+    parser.add_argument("--stage", type=int, default=1)
+    parser.add_argument("--memprofile", action="store_true", help="report retained memory after every restart/stage transition")
+    parser.add_argument("--telemetry", action="store_true", help="record per-tick telemetry to game_data_ticks.csv")
+    parser.add_argument("--combat-log", type=float, nargs="?", const=1.0, default=0.0, metavar="RATE",
+                        help="log sampled damage/heal events to game_data_combat.bin (RATE: fraction kept, default all)")
+    parser.add_argument("--world-screens", type=int, default=1, help="battlefield width in screens")
+    parser.add_argument("--render-scale", type=float, default=ScreenManager.RENDER_SCALE,
+                        help="internal resolution as a fraction of 800x400, e.g. 0.5 on weak machines")
+    parser.add_argument("--window", type=int, nargs=2, metavar=("W", "H"), help="window size, the render target is scaled to fit")
+    parser.add_argument("--smooth", action="store_true", help="linear instead of nearest-pixel window scaling")
+    parser.add_argument("--broadcast", type=int, nargs="?", const=StateBroadcaster.PORT, metavar="PORT",
+                        help="publish battle state to spectators on 127.0.0.1:PORT")
+    parser.add_argument("--broadcast-rate", type=float, default=StateBroadcaster.RATE, help="broadcast frames per second")
+    parser.add_argument("--snapshot-interval", type=float, default=Tracker.SNAPSHOT_INTERVAL, help="seconds per CSV row")
+    parser.add_argument("--max-frames", type=int, help="exit after this many frames (used by benchmarks/startup.py)")
+    parser.add_argument("--split", action="store_true", help="run the simulation in its own process, rendering from shared memory")
+    args = parser.parse_args()
+    Tracker.HIGH_RES = args.telemetry
+    Tracker.COMBAT_LOG = args.combat_log
+    Tracker.SNAPSHOT_INTERVAL = args.snapshot_interval
+    GameManager.WORLD_WIDTH = args.world_screens * ScreenManager.WIDTH
+    ScreenManager.RENDER_SCALE = args.render_scale
+    ScreenManager.WINDOW_SIZE = args.window
+    ScreenManager.SCALE_MODE = "smooth" if args.smooth else "pixel"
+    if args.simulate:
+        if not args.policy:
+            parser.error("--simulate requires --policy")
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        wins = 0
+        for run in range(args.simulate):
+            start = time.perf_counter()
+            game = simulate(POLICIES[args.policy](), args.stage)
+            result = game.result()
+            wins += result == "win"
+            print(f"run {run + 1}: {result} in {game.ticks} ticks ({time.perf_counter() - start:.2f}s)")
+        print(f"{wins}/{args.simulate} wins")
+        sys.exit(0)
+    policy = POLICIES[args.policy]() if args.policy else None
+    broadcast = (args.broadcast, args.broadcast_rate) if args.broadcast is not None else None
+    if args.split:
+        # the simulation process is spawned fresh, so it has to be told about every class setting changed above
+        overrides = [(Tracker, "HIGH_RES", Tracker.HIGH_RES), (Tracker, "SNAPSHOT_INTERVAL", Tracker.SNAPSHOT_INTERVAL),
+                     (Tracker, "COMBAT_LOG", Tracker.COMBAT_LOG), (GameManager, "WORLD_WIDTH", GameManager.WORLD_WIDTH)]
+        sim = SimulationProcess(GameManager, policy, broadcast, overrides)
+        main(memprofile=args.memprofile, max_frames=args.max_frames, sim=sim)
+    else:
+        broadcaster = StateBroadcaster(port=args.broadcast, rate=args.broadcast_rate).start() if broadcast else None
+        main(policy, args.memprofile, broadcaster, args.max_frames)
\ No newline at end of file
@@ -1,37 +1,53 @@
-import tkinter as tk
 import multiprocessing
-from visualizer.stats import StatsVisualizer
+import queue
 
 class SettingsWindow:
-    def __init__(self, game, tk_root):
-        self.game = game
+    def __init__(self, tk_root, commands):
         self.root = tk_root
-        self.visualizer = None
+        self.commands = commands
         self.window = None
+        self.paused = False
 
 
     def toggle_pause_gui(self, button):
-        self.game.paused = not self.game.paused
-        button.config(text="Resume Game" if self.game.paused else "Pause Game")
+        self.paused = not self.paused
+        self.commands.put("pause" if self.paused else "resume")
+        button.config(text="Resume Game" if self.paused else "Pause Game")
 
     def open_analytics(self):
-        multiprocessing.Process(target=StatsVisualizer.launch_in_new_process).start()
+        self.commands.put("open_stats")
 
     def quit_game(self, win):
-        self.game.running = False
-        self.game.was_forced_quit = True
+        self.commands.put("end_battle")
         win.destroy()
-        
+
     def close_window(self):
         if self.window:
             self.window.destroy()
             self.window = None
-        
-    def run(self):
+
+    def poll_requests(self, requests):
+        while True:
+            try:
+                request, paused = requests.get_nowait()
+            except queue.Empty:
+                break
+            if request == "toggle":
+                self.run(paused)
+            elif request == "close":
+                self.close_window()
+            elif request == "stop":
+                self.root.destroy()
+                return
+        self.root.after(50, self.poll_requests, requests)
+
+    def run(self, paused=False):
         if self.window and self.window.winfo_exists():
             self.close_window()
             return
 
+        import tkinter as tk
+        self.paused = paused
         self.window = tk.Toplevel(self.root)
         self.window.title("Settings")
         self.window.geometry("250x260")
@@ -39,11 +55,83 @@ class SettingsWindow:
 
         pause_button = tk.Button(
             self.window,
-            text="Resume Game" if self.game.paused else "Pause Game",
+            text="Resume Game" if self.paused else "Pause Game",
             command=lambda: self.toggle_pause_gui(pause_button)
         )
         pause_button.pack(pady=10)
 
         tk.Button(self.window, text="Show Stats", command=self.open_analytics).pack(pady=10)
         tk.Button(self.window, text="End Battle", command=lambda: self.quit_game(self.window)).pack(pady=10)
-        tk.Button(self.window, text="Close", command=self.close_window).pack(pady=10)
\ No newline at end of file
+        tk.Button(self.window, text="Close", command=self.close_window).pack(pady=10)
+
+# tkinter and the analytics stack (pandas, seaborn, matplotlib) are only imported by the child
+# processes that use them, so the game itself starts without paying for them
+def run_settings_process(requests, commands):
+    import tkinter as tk
+    root = tk.Tk()
+    root.withdraw()
+    SettingsWindow(root, commands).poll_requests(requests)
+    root.mainloop()
+
+def run_analytics_process(requests):
+    from visualizer.stats import StatsVisualizer
+    StatsVisualizer().serve(requests)
+
+def stop_process(process, requests, message):
+    if process and process.is_alive():
+        requests.put(message)
+        process.join(timeout=1)
+        if process.is_alive():
+            process.terminate()
+
+class SettingsChannel:
+    def __init__(self):
+        self.process = None
+        self.requests = None
+        self.commands = None
+        self.analytics = None
+        self.analytics_requests = None
+
+    def start(self):
+        if self.process and self.process.is_alive():
+            return
+        self.requests = multiprocessing.Queue()
+        self.commands = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=run_settings_process, args=(self.requests, self.commands), daemon=True
+        )
+        self.process.start()
+
+    def run(self, paused=False):
+        self.start()
+        self.requests.put(("toggle", paused))
+
+    def close_window(self):
+        if self.process and self.process.is_alive():
+            self.requests.put(("close", None))
+
+    def poll(self):
+        if self.commands is None:
+            return []
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def open_analytics(self):
+        # spawned on the first request only; later requests re-show its window with cached data and figures
+        if not (self.analytics and self.analytics.is_alive()):
+            self.analytics_requests = multiprocessing.Queue()
+            self.analytics = multiprocessing.Process(
+                target=run_analytics_process, args=(self.analytics_requests,), daemon=True
+            )
+            self.analytics.start()
+        self.analytics_requests.put("show")
+
+    def stop(self):
+        stop_process(self.process, self.requests, ("stop", None))
+        stop_process(self.analytics, self.analytics_requests, "stop")
+        self.process = None
+        self.analytics = None
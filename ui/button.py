@@ -1,26 +1,43 @@
 import pygame
-import time
+from core.clock import clock
+from core.screen import ScreenManager
+from core.events import events, EnergySpent
+
+def outline():
+    # never 0: pygame.draw.rect fills when width is 0
+    return max(ScreenManager.px(2), 1)
 
 class Button:
+    # rect and font_size are in layout units; the button lives on the render target in pixels
     def __init__(self, rect, label, on_click=None, color=(0, 200, 0), text_color=(0, 0, 0), font_size=24):
-        self.rect = pygame.Rect(rect)
+        self.rect = pygame.Rect([ScreenManager.px(v) for v in rect])
         self.label = label
         self.on_click = on_click
         self.color = color
         self.text_color = text_color
         self.font_size = font_size
         self.enabled = True
+        self._text_key = None
+        self._text_surf = None
+
+    def text_surface(self):
+        key = (self.label, self.text_color, self.font_size)
+        if key != self._text_key:
+            font = pygame.font.SysFont("arial", ScreenManager.px(self.font_size), bold=True)
+            self._text_surf = font.render(self.label, True, self.text_color)
+            self._text_key = key
+        return self._text_surf
 
     def draw(self, surface):
-        mouse_over = self.rect.collidepoint(pygame.mouse.get_pos())
+        mouse_over = self.rect.collidepoint(ScreenManager.mouse_pos())
         current_color = tuple(min(255, c + 30) for c in self.color) if mouse_over and self.enabled else self.color
-        shadow_offset = 4
+        shadow_offset = ScreenManager.px(4)
+        radius = ScreenManager.px(5)
         shadow_rect = self.rect.move(shadow_offset, shadow_offset)
-        pygame.draw.rect(surface, (50, 50, 50), shadow_rect, border_radius=5)
-        pygame.draw.rect(surface, current_color, self.rect, border_radius=5)
-        pygame.draw.rect(surface, (0, 0, 0), self.rect, 2, border_radius=5)
-        font = pygame.font.SysFont("arial", self.font_size, bold=True)
-        text_surf = font.render(self.label, True, self.text_color)
+        pygame.draw.rect(surface, (50, 50, 50), shadow_rect, border_radius=radius)
+        pygame.draw.rect(surface, current_color, self.rect, border_radius=radius)
+        pygame.draw.rect(surface, (0, 0, 0), self.rect, outline(), border_radius=radius)
+        text_surf = self.text_surface()
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -37,25 +54,25 @@ class UpgradeButton(Button):
         self.last_fail_time = 0
 
     def update_label(self, res_mgr):
-        if res_mgr.upgrade_clicks >= 5:
+        if res_mgr.upgrade_clicks >= res_mgr.MAX_UPGRADES:
             self.label = "Maxed"
-        elif time.time() - self.last_upgrade_time < 1:
+        elif clock.now() - self.last_upgrade_time < 1:
             self.label = "Upgraded!"
-        elif time.time() - self.last_fail_time < 1:
+        elif clock.now() - self.last_fail_time < 1:
             self.label = "Not enough!"
         else:
-            cost = 20 + 10 * res_mgr.upgrade_clicks
-            self.label = f"Upgrade ({cost})"
+            self.label = f"Upgrade ({res_mgr.upgrade_cost()})"
 
     def draw(self, surface, res_mgr):
         self.update_label(res_mgr)
-        mouse_over = self.rect.collidepoint(pygame.mouse.get_pos())
-        color = (150, 150, 150) if res_mgr.upgrade_clicks >= 5 else (250, 180, 0)
-        if mouse_over and res_mgr.upgrade_clicks < 5:
+        mouse_over = self.rect.collidepoint(ScreenManager.mouse_pos())
+        color = (150, 150, 150) if res_mgr.upgrade_clicks >= res_mgr.MAX_UPGRADES else (250, 180, 0)
+        if mouse_over and res_mgr.upgrade_clicks < res_mgr.MAX_UPGRADES:
             color = (255, 210, 50)
-        pygame.draw.rect(surface, color, self.rect, border_radius=5)
-        pygame.draw.rect(surface, (0, 0, 0), self.rect, 2, border_radius=5)
-        font = pygame.font.Font(None, 24)
+        radius = ScreenManager.px(5)
+        pygame.draw.rect(surface, color, self.rect, border_radius=radius)
+        pygame.draw.rect(surface, (0, 0, 0), self.rect, outline(), border_radius=radius)
+        font = pygame.font.Font(None, ScreenManager.px(24))
         label_surf = font.render(self.label, True, (0, 0, 0))
         label_x = self.rect.centerx - label_surf.get_width() // 2
         label_y = self.rect.centery - label_surf.get_height() // 2
@@ -63,12 +80,15 @@ class UpgradeButton(Button):
 
     def try_click(self, event_pos, res_mgr):
         if self.rect.collidepoint(event_pos):
-            upgrade_cost = 20 + 10 * res_mgr.upgrade_clicks
-            if res_mgr.energy >= upgrade_cost and res_mgr.upgrade_clicks < 5:
-                res_mgr.upgrade_energy()
-                self.last_upgrade_time = time.time()
-            else:
-                self.last_fail_time = time.time()
+            self.try_upgrade(res_mgr)
+
+    def try_upgrade(self, res_mgr):
+        if res_mgr.can_upgrade():
+            res_mgr.upgrade_energy()
+            self.last_upgrade_time = clock.now()
+            return True
+        self.last_fail_time = clock.now()
+        return False
 
 class HeroButton(Button):
     def __init__(self, x, cls, cost, cooldown):
@@ -78,11 +98,11 @@ class HeroButton(Button):
         self.last = 0
         self.width = 80
         self.height = 55
-        rect = (x, pygame.display.get_surface().get_height() - 70, self.width, self.height)
+        rect = (x, ScreenManager.HEIGHT - 70, self.width, self.height)
         super().__init__(rect=rect, label=cls.__name__, font_size=20)
 
     def is_ready(self):
-        return time.time() - self.last >= self.cooldown
+        return clock.now() - self.last >= self.cooldown
 
     def draw(self, surface, res_mgr):
         color_map = {
@@ -93,31 +113,35 @@ class HeroButton(Button):
         }
         base_color = color_map.get(self.cls.__name__, (180, 180, 180))
         ready = self.is_ready() and res_mgr.can_afford(self.cost)
-        mouse_over = self.rect.collidepoint(pygame.mouse.get_pos())
+        mouse_over = self.rect.collidepoint(ScreenManager.mouse_pos())
         color = (150, 150, 150) if not ready else (tuple(min(255, c + 40) for c in base_color) if mouse_over else base_color)
-        pygame.draw.rect(surface, color, self.rect, border_radius=5)
-        pygame.draw.rect(surface, (0, 0, 0), self.rect, 2, border_radius=5)
-        name_font = pygame.font.Font(None, 24)
-        small_font = pygame.font.Font(None, 18)
+        radius = ScreenManager.px(5)
+        pygame.draw.rect(surface, color, self.rect, border_radius=radius)
+        pygame.draw.rect(surface, (0, 0, 0), self.rect, outline(), border_radius=radius)
+        name_font = pygame.font.Font(None, ScreenManager.px(24))
+        small_font = pygame.font.Font(None, ScreenManager.px(18))
         name_surf = name_font.render(self.cls.__name__, True, (0, 0, 0))
         cost_surf = small_font.render(f"{self.cost} Energy", True, (0, 0, 0))
         name_x = self.rect.x + (self.rect.width - name_surf.get_width()) // 2
         cost_x = self.rect.x + (self.rect.width - cost_surf.get_width()) // 2
-        total_height = name_surf.get_height() + cost_surf.get_height() + 4
+        gap = ScreenManager.px(4)
+        total_height = name_surf.get_height() + cost_surf.get_height() + gap
         name_y = self.rect.y + (self.rect.height - total_height) // 2
-        cost_y = name_y + name_surf.get_height() + 4
+        cost_y = name_y + name_surf.get_height() + gap
         surface.blit(name_surf, (name_x, name_y))
         surface.blit(cost_surf, (cost_x, cost_y))
         if not self.is_ready():
-            cd_ratio = (time.time() - self.last) / self.cooldown
+            cd_ratio = (clock.now() - self.last) / self.cooldown
             cd_ratio = min(max(cd_ratio, 0), 1)
-            bar_width = int(self.width * cd_ratio)
-            pygame.draw.rect(surface, (100, 100, 100), (self.rect.x, self.rect.y, bar_width, 5))
+            bar_width = int(self.rect.width * cd_ratio)
+            pygame.draw.rect(surface, (100, 100, 100), (self.rect.x, self.rect.y, bar_width, max(ScreenManager.px(5), 1)))
 
     def try_spawn(self, game):
         if self.is_ready() and game.res_mgr.can_afford(self.cost):
             hero = game.create_hero(self.cls)
             game.heroes.append(hero)
             game.res_mgr.spend(self.cost)
-            game.tracker.log_energy_spent(self.cost)
-            self.last = time.time()
\ No newline at end of file
+            events.emit(EnergySpent, self.cost, hero.name)
+            self.last = clock.now()
+            return True
+        return False
\ No newline at end of file
@@ -0,0 +1,109 @@
+import math
+import pygame
+from core.clock import clock
+from core.screen import ScreenManager
+from core.render import BARS, MARKERS, scaled
+
+class HealthBarCache:
+    def __init__(self, width, height, fill_color=(0, 200, 0), back_color=(200, 0, 0), border=1, steps=None):
+        self.width = width
+        self.height = height
+        self.fill_color = fill_color
+        self.back_color = back_color
+        self.border = border
+        self.steps = steps or width
+        self._bars = {}
+
+    def get(self, ratio):
+        step = int(self.steps * min(max(ratio, 0), 1))
+        bar = self._bars.get(step)
+        if bar is None:
+            bar = self._build(step)
+            self._bars[step] = bar
+        return bar
+
+    def _build(self, step):
+        b = self.border
+        bar = pygame.Surface((self.width + 2 * b, self.height + 2 * b), pygame.SRCALPHA)
+        if b:
+            bar.fill((0, 0, 0))
+        if self.back_color:
+            bar.fill(self.back_color, (b, b, self.width, self.height))
+        fill_width = int(self.width * step / self.steps)
+        if fill_width > 0:
+            bar.fill(self.fill_color, (b, b, fill_width, self.height))
+        return bar
+
+    def draw(self, surface, x, y, ratio):
+        surface.blit(scaled(self.get(ratio)), (ScreenManager.px(x - self.border), ScreenManager.px(y - self.border)))
+
+    def submit(self, queue, x, y, ratio):
+        queue.submit(self.get(ratio), (x - self.border, y - self.border), BARS)
+
+class SkillMarkerCache:
+    # the pulsing dot over a casting hero, pre-rendered per integer radius instead of two draw.circle calls
+    def __init__(self, color=(255, 255, 0), outline=(0, 0, 0), border=2):
+        self.color = color
+        self.outline = outline
+        self.border = border
+        self._markers = {}
+
+    def get(self, radius):
+        marker = self._markers.get(radius)
+        if marker is None:
+            size = radius + self.border
+            marker = pygame.Surface((2 * size + 1, 2 * size + 1), pygame.SRCALPHA)
+            pygame.draw.circle(marker, self.outline, (size, size), size)
+            pygame.draw.circle(marker, self.color, (size, size), radius)
+            self._markers[radius] = marker
+        return marker
+
+    def submit(self, queue, x, y, now):
+        radius = int(5 + 1.5 * math.sin(now * 8))
+        size = radius + self.border
+        queue.submit(self.get(radius), (int(x) - size, int(y) - size), MARKERS)
+
+UNIT_HEALTH_BAR = HealthBarCache(40, 6)
+SKILL_MARKER = SkillMarkerCache()
+BASE_HEALTH_BAR = HealthBarCache(50, 10, fill_color=ScreenManager.RED, back_color=None, border=0)
+
+class HUD:
+    # drawn straight onto the render target, so every position and size goes through ScreenManager.px
+    def __init__(self):
+        self.font = pygame.font.Font(None, ScreenManager.px(24))
+        self.plus_surf = self.font.render("+10", True, (0, 200, 0))
+        self._energy_key = None
+        self._energy_surf = None
+        self._stage_key = None
+        self._stage_surf = None
+
+    def energy_surface(self, res_mgr):
+        key = (int(res_mgr.energy), int(res_mgr.max_energy))
+        if key != self._energy_key:
+            self._energy_surf = self.font.render(f"Energy: {key[0]} / {key[1]}", True, ScreenManager.BLACK)
+            self._energy_key = key
+        return self._energy_surf
+
+    def stage_surface(self, stage):
+        if stage != self._stage_key:
+            self._stage_surf = self.font.render(f"Stage: {stage}", True, ScreenManager.BLACK)
+            self._stage_key = stage
+        return self._stage_surf
+
+    def draw(self, surface, res_mgr, stage):
+        px = ScreenManager.px
+        energy_render = self.energy_surface(res_mgr)
+        surface.blit(energy_render, (px(10), px(10)))
+        stage_render = self.stage_surface(stage)
+        surface.blit(stage_render, (surface.get_width() // 2 - stage_render.get_width() // 2, px(10)))
+        if clock.now() - res_mgr.last_upgrade_display_time < 1:
+            surface.blit(self.plus_surf, (px(10) + energy_render.get_width() + px(5), px(10)))
+
+    def draw_scrollbar(self, surface, camera):
+        px = ScreenManager.px
+        track_width = surface.get_width() - px(20)
+        thumb_x = px(10) + track_width * camera.x // camera.world_width
+        thumb_width = max(track_width * camera.view.width // camera.world_width, px(8))
+        height = max(px(4), 1)
+        surface.fill((60, 60, 60), (px(10), px(2), track_width, height))
+        surface.fill(ScreenManager.WHITE, (thumb_x, px(2), thumb_width, height))
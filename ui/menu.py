@@ -9,29 +9,53 @@ class Menu:
         full_bg = pygame.image.load(bg_image_path).convert()
         cropped_height = full_bg.get_height() - 50
         cropped_bg = full_bg.subsurface(pygame.Rect(0, 0, full_bg.get_width(), cropped_height))
-        self.background = pygame.transform.scale(cropped_bg, (ScreenManager.WIDTH, ScreenManager.HEIGHT))
+        self.background = pygame.transform.scale(cropped_bg, ScreenManager.target_size())
         self.buttons = []
+        self.static_surface = None
+        self.last_hover = None
+        self.dirty = True
+
+    def invalidate(self):
+        self.dirty = True
 
     def draw_background(self):
         surface = self.screen_mgr.surface
-        surface.blit(self.background, (0, 0))
+        if self.static_surface is None:
+            self.static_surface = self.background.copy()
+            self.draw_static(self.static_surface)
+        surface.blit(self.static_surface, (0, 0))
+
+    def draw_static(self, surface):
+        pass
 
     def draw_buttons(self):
         for btn in self.buttons:
             btn.draw(self.screen_mgr.surface)
 
+    def hover_state(self):
+        mouse_pos = ScreenManager.mouse_pos()
+        return tuple(btn.rect.collidepoint(mouse_pos) for btn in self.buttons)
+
     def handle_event(self, event):
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.invalidate()
         for btn in self.buttons:
             btn.handle_event(event)
         return self.result
 
     def draw(self):
+        hover = self.hover_state()
+        if not self.dirty and hover == self.last_hover:
+            return False
         self.draw_background()
         self.draw_buttons()
         self.screen_mgr.update()
+        self.last_hover = hover
+        self.dirty = False
+        return True
 
 class MainMenu(Menu):
-    def __init__(self, screen_mgr):
+    def __init__(self, screen_mgr, can_resume=False):
         super().__init__(screen_mgr, "assets/Background/Stage3.png")
         self.play_button = Button(
             rect=(ScreenManager.WIDTH // 2 - 60, ScreenManager.HEIGHT // 2 + 100, 120, 55),
@@ -43,16 +67,27 @@ class MainMenu(Menu):
         )
         self.buttons = [self.play_button, self.quit_button]
 
+        if can_resume:
+            self.resume_button = Button(
+                rect=(ScreenManager.WIDTH // 2 - 60, ScreenManager.HEIGHT // 2 + 100, 120, 55),
+                label="RESUME", on_click=self.resume_game, color=(0, 150, 250)
+            )
+            self.play_button.rect.x -= ScreenManager.px(70)
+            self.resume_button.rect.x += ScreenManager.px(70)
+            self.buttons.insert(1, self.resume_button)
+
     def start_game(self):
         self.result = "start"
 
+    def resume_game(self):
+        self.result = "resume"
+
     def quit_game(self):
         pygame.quit()
         import sys
         sys.exit()
 
-    def draw(self):
-        super().draw_background()
+    def draw_static(self, surface):
         instructions = [
             "INSTRUCTIONS:",
             "- Click hero buttons to deploy units (costs energy)",
@@ -62,15 +97,14 @@ class MainMenu(Menu):
             "- Win to advance to the next stage!",
             "- Destroy enemy base to win!"
         ]
-        font_title = pygame.font.Font(None, 30)
-        font_instr = pygame.font.Font(None, 22)
+        px = ScreenManager.px
+        font_title = pygame.font.Font(None, px(30))
+        font_instr = pygame.font.Font(None, px(22))
         y_start = ScreenManager.HEIGHT // 4 - 20
         for i, line in enumerate(instructions):
             font = font_title if i == 0 else font_instr
             surf = font.render(line, True, ScreenManager.BLACK)
-            self.screen_mgr.surface.blit(surf, (ScreenManager.WIDTH // 2 - surf.get_width() // 2, y_start + i * 30))
-        super().draw_buttons()
-        self.screen_mgr.update()
+            surface.blit(surf, (surface.get_width() // 2 - surf.get_width() // 2, px(y_start + i * 30)))
 
 class EndScreen(Menu):
     def __init__(self, screen_mgr, is_victory):
@@ -113,10 +147,10 @@ class EndScreen(Menu):
         import sys
         sys.exit()
 
-    def draw(self):
-        super().draw_background()
-        font_title = pygame.font.Font(None, 60)
-        font_sub = pygame.font.Font(None, 28)
+    def draw_static(self, surface):
+        px = ScreenManager.px
+        font_title = pygame.font.Font(None, px(60))
+        font_sub = pygame.font.Font(None, px(28))
 
         if self.is_victory is None:
             title = "BATTLE QUIT"
@@ -134,9 +168,6 @@ class EndScreen(Menu):
         title_surf = font_title.render(title, True, color)
         subtitle_surf = font_sub.render(subtitle, True, ScreenManager.BLACK)
 
-        surface = self.screen_mgr.surface
-        surface.blit(title_surf, (ScreenManager.WIDTH // 2 - title_surf.get_width() // 2, ScreenManager.HEIGHT // 3))
-        surface.blit(subtitle_surf, (ScreenManager.WIDTH // 2 - subtitle_surf.get_width() // 2, ScreenManager.HEIGHT // 3 + 50))
-
-        super().draw_buttons()
-        self.screen_mgr.update()
\ No newline at end of file
+        center = surface.get_width() // 2
+        surface.blit(title_surf, (center - title_surf.get_width() // 2, px(ScreenManager.HEIGHT // 3)))
+        surface.blit(subtitle_surf, (center - subtitle_surf.get_width() // 2, px(ScreenManager.HEIGHT // 3 + 50)))
\ No newline at end of file
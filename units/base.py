@@ -1,6 +1,8 @@
 from core.screen import ScreenManager
 from combat.character import Character
 from core.animation import Animation
+from ui.hud import BASE_HEALTH_BAR
+from core.render import scaled
 import pygame
 
 class Base:
@@ -16,27 +18,56 @@ class Base:
             (self.width // scale_factor, self.height // scale_factor)
         )
 
-    def draw(self, surface):
+    def draw_rect(self):
         y_pos = ScreenManager.HEIGHT // 2
-        surface.blit(self.image, (self.x, y_pos))
-        pygame.draw.rect(surface, ScreenManager.RED, (self.x, y_pos - 20, self.health / 2, 10))
+        return pygame.Rect(self.x, y_pos - 20, self.image.get_width(), self.image.get_height() + 20)
+
+    def draw(self, surface, camera_x=0):
+        x = self.x - camera_x
+        y_pos = ScreenManager.HEIGHT // 2
+        surface.blit(scaled(self.image), (ScreenManager.px(x), ScreenManager.px(y_pos)))
+        BASE_HEALTH_BAR.draw(surface, x, y_pos - 20, self.health / 100)
+
+    def submit(self, queue, camera_x=0):
+        x = self.x - camera_x
+        y_pos = ScreenManager.HEIGHT // 2
+        queue.submit(self.image, (x, y_pos))
+        BASE_HEALTH_BAR.submit(queue, x, y_pos - 20, self.health / 100)
 
 class BaseTarget(Character):
-    def __init__(self, base: Base):
-        super().__init__(base.x - 20, ScreenManager.HEIGHT // 2, base.health, 0)
+    def __init__(self, base: Base, name=None):
         self.base = base
+        super().__init__(base.x - 20, ScreenManager.HEIGHT // 2, base.health, 0)
+        if name:
+            self.name = name
         self.is_dying = False
         self.dead_anim = Animation([], loop=False)
         self.dead_anim.finished = True
 
+    @property
+    def health(self):
+        return self.base.health
+
+    @health.setter
+    def health(self, value):
+        self.base.health = value
+
     def take_damage(self, dmg):
         self.health -= dmg
-        self.base.health = self.health
         if self.health <= 0:
-            self.alive = False
+            self.die()
+
+    def die(self):
+        self.alive = False
 
-    def update(self, heroes):
+    def update(self, heroes, resolver):
         pass
 
-    def draw(self, surface):
-        self.base.draw(surface)
+    def update_animation(self):
+        pass
+
+    def draw_rect(self):
+        return self.base.draw_rect()
+
+    def submit(self, queue, camera_x=0):
+        self.base.submit(queue, camera_x)
@@ -1,51 +1,59 @@
 from core.screen import ScreenManager
 from core.animation import Animation
+from ui.hud import UNIT_HEALTH_BAR
 from combat.character import Character, Attack
 import pygame
 
 class Enemy(Character):
-    def __init__(self, anims):
-        sprite_height = anims["move"][0].get_height()
+    def __init__(self, anims, x=ScreenManager.WIDTH - 50):
+        sprite_height = anims["move"][0].cell_size[1]
         y = (ScreenManager.HEIGHT // 2 + 50) - sprite_height
-        super().__init__(ScreenManager.WIDTH - 50, y, 200, -1.5)
+        super().__init__(x, y, 200, -1.5)
         self.attack = Attack(20, 0.5)
         self.animations = {k: Animation(v) for k, v in anims.items()}
         self.current_state = "move"
         self.is_dying = False
         self.dead_anim = Animation(anims.get("dead", []), loop=False)
+        self.bar_offset = 80
 
-    def update(self, heroes):
+    def update(self, heroes, resolver):
         if self.is_dying:
             return
-        self.animations[self.current_state].update()
 
         for hero in heroes:
             if not hero.alive or hero.is_dying:
                 continue
             hero_center = hero.x + 20
             if abs(self.x - hero_center) <= 40:
-                self.attack.attack_target(hero)
+                self.attack.attack_target(hero, self, resolver)
                 return
         self.move()
 
-    def draw(self, surface):
+    def update_animation(self):
+        if self.current_state in self.animations:
+            self.animations[self.current_state].update()
+
+    def current_frame(self):
+        if self.is_dying:
+            return self.dead_anim.get_frame()
+        return self.animations[self.current_state].get_frame()
+
+    def draw_rect(self):
+        frame = self.current_frame()
+        return pygame.Rect(self.x + frame.dx, self.y + frame.dy, frame.get_width(), frame.get_height())
+
+    def submit(self, queue, camera_x=0):
+        x = self.x - camera_x
         if self.is_dying and self.dead_anim:
             if self.dead_anim.finished:
                 return
             frame = self.dead_anim.get_frame()
-            surface.blit(frame, (self.x - frame.get_width() // 2, self.y))
+            queue.submit(frame, (x + frame.dx, self.y + frame.dy))
             return
 
         if self.alive and self.current_state in self.animations:
-            self.animations[self.current_state].update()
+            self.update_animation()
             frame = self.animations[self.current_state].get_frame()
-            surface.blit(frame, (self.x - frame.get_width() // 2, self.y))
-
-            bar_width = 40
-            bar_height = 6
-            health_ratio = self.health / self.max_health
-            hp_x = self.x - bar_width // 2
-            hp_y = self.y + 80
-            pygame.draw.rect(surface, (0, 0, 0), (hp_x - 1, hp_y - 1, bar_width + 2, bar_height + 2))
-            pygame.draw.rect(surface, (200, 0, 0), (hp_x, hp_y, bar_width, bar_height))
-            pygame.draw.rect(surface, (0, 200, 0), (hp_x, hp_y, int(bar_width * health_ratio), bar_height))
\ No newline at end of file
+            queue.submit(frame, (x + frame.dx, self.y + frame.dy))
+
+            UNIT_HEALTH_BAR.submit(queue, x - UNIT_HEALTH_BAR.width // 2, self.y + self.bar_offset, self.health / self.max_health)
\ No newline at end of file
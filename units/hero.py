@@ -3,103 +3,115 @@ from combat.character import Character, Attack
 from combat.skill import Skill, AreaDamageEffect, BuffAttackSpeedEffect, GroupHealEffect
 from combat.projectile import Projectile
 from core.animation import Animation
+from ui.hud import UNIT_HEALTH_BAR, SKILL_MARKER
 import pygame
-import time
+from core.clock import clock
+from core.events import events, SkillCast
+
+PROJECTILE_IMAGE = pygame.Surface((10, 10))
+PROJECTILE_IMAGE.fill((255, 100, 0))
 
 class Hero(Character):
+    PROJECTILE_RANGE = 300
+
     def __init__(self, name, health, speed, dmg, atk_cd, anims, skill=None):
-        sprite_height = anims["move"][0].get_height()
+        sprite_height = anims["move"][0].cell_size[1]
         y = (ScreenManager.HEIGHT // 2 + 50) - sprite_height
         center_x = 50
         super().__init__(center_x, y , health, speed)
         self.name = name
         self.attack = Attack(dmg, atk_cd)
-        self.animations = {k: Animation(v) for k, v in anims.items()}
+        self.animations = {k: Animation(anims, state=k) for k in anims}
         self.current_state = "move"
         self.skill = skill
-        self.dead_anim = Animation(anims["dead"], loop=False)
+        self.dead_anim = Animation(anims, loop=False, state="dead")
         self.is_dying = False
         self.ready_to_remove = False
         self.skill_anim_start_time = 0
         self.skill_anim_duration = 0
         self.skill_completed = False
+        self.bar_offset = 30
 
-    def update_animation(self):
+    def update_skill_state(self):
         if self.current_state == "skill":
-            elapsed = time.time() - self.skill_anim_start_time
+            elapsed = clock.now() - self.skill_anim_start_time
             if elapsed >= self.skill_anim_duration and not self.skill_completed:
                 self.skill_completed = True
                 self.reset_state()
 
+    def update_animation(self):
+        self.update_skill_state()
         if self.current_state in self.animations:
             self.animations[self.current_state].update()
 
-    def draw(self, surface):
+    def current_frame(self):
+        if self.is_dying:
+            return self.dead_anim.get_frame()
+        return self.animations[self.current_state].get_frame()
+
+    def draw_rect(self):
+        frame = self.current_frame()
+        return pygame.Rect(self.x + frame.dx, self.y + frame.dy, frame.get_width(), frame.get_height())
+
+    def submit(self, queue, camera_x=0):
+        x = self.x - camera_x
         if self.is_dying and self.dead_anim:
             frame = self.dead_anim.get_frame()
-            surface.blit(frame, (self.x - frame.get_width() // 2, self.y))
+            queue.submit(frame, (x + frame.dx, self.y + frame.dy))
             return
 
         if self.alive and self.current_state in self.animations:
             self.update_animation()
             frame = self.animations[self.current_state].get_frame()
-            surface.blit(frame, (self.x - frame.get_width() // 2, self.y))
-            bar_width = 40
-            bar_height = 6
-            health_ratio = self.health / self.max_health
-            hp_x = self.x - bar_width // 2
-            hp_y = self.y + 30
-            pygame.draw.rect(surface, (0, 0, 0), (hp_x - 1, hp_y - 1, bar_width + 2, bar_height + 2))
-            pygame.draw.rect(surface, (200, 0, 0), (hp_x, hp_y, bar_width, bar_height))
-            pygame.draw.rect(surface, (0, 200, 0), (hp_x, hp_y, int(bar_width * health_ratio), bar_height))
+            queue.submit(frame, (x + frame.dx, self.y + frame.dy))
+            UNIT_HEALTH_BAR.submit(queue, x - UNIT_HEALTH_BAR.width // 2, self.y + self.bar_offset, self.health / self.max_health)
 
             if self.current_state == "skill":
-                import math
-                radius = 5 + 1.5 * math.sin(time.time() * 8)
-                center = (int(self.x), int(self.y - 12))
-                pygame.draw.circle(surface, (0, 0, 0), center, int(radius) + 2)
-                pygame.draw.circle(surface, (255, 255, 0), center, int(radius))
+                SKILL_MARKER.submit(queue, x, self.y - 12, clock.now())
 
-    def try_attack(self, target):
+    def try_attack(self, target, resolver):
         if self.attack.can_attack():
             self.current_state = "attack"
-            self.attack.attack_target(target)
+            self.attack.attack_target(target, self, resolver)
 
     def try_skill(self, targets, game):
         if self.skill and self.skill.can_use_skill():
             self.current_state = "skill"
-            self.skill.use(self, targets)
-            game.tracker.log_ability_used(self.skill.name)
-            self.skill_anim_start_time = time.time()
+            self.skill.use(self, targets, game.resolver)
+            events.emit(SkillCast, self.name, self.skill.name)
+            self.skill_anim_start_time = clock.now()
             self.skill_anim_duration = self.skill.cast_duration
             self.skill_completed = False
 
             if isinstance(self.skill.effect, AreaDamageEffect) and targets:
                 for target in targets:
-                    proj_img = pygame.Surface((10,10))
-                    proj_img.fill((255,100,0))
-                    proj = Projectile(
-                        self.x, self.y,
-                        target.x, target.y,
-                        speed=4,
-                        image=proj_img,
-                        damage=self.skill.effect.damage,
-                        on_hit_callback=lambda t=target: self.skill.effect.apply(self, [t]),
-                        max_range=300
-                    )
-                    game.projectiles.append(proj)
+                    # the blast is queued at cast; projectiles only show it and expire after PROJECTILE_RANGE
+                    if abs(target.x - self.x) <= self.PROJECTILE_RANGE:
+                        game.projectiles.append(self.skill_projectile(self.x, self.y, target.x, target.y, target))
+
+    def skill_projectile(self, x, y, target_x, target_y, target):
+        return Projectile(
+            x, y,
+            target_x, target_y,
+            speed=4,
+            image=PROJECTILE_IMAGE,
+            damage=self.skill.effect.damage,
+            max_range=self.PROJECTILE_RANGE,
+            owner=self,
+            target=target
+        )
 
     def reset_state(self):
         self.current_state = "move"
 
     def update(self, enemies, allies, game):
-        if hasattr(self, "buff_end_time") and time.time() >= self.buff_end_time:
+        if hasattr(self, "buff_end_time") and clock.now() >= self.buff_end_time:
             if hasattr(self, "original_cooldown"):
                 self.attack.cooldown = self.original_cooldown
                 del self.buff_end_time
                 del self.original_cooldown
 
-        self.update_animation()
+        self.update_skill_state()
         if self.current_state == "skill":
             return
 
@@ -111,9 +123,9 @@ class Hero(Character):
 
         if enemies_in_front:
             target = min(enemies_in_front, key=lambda e: e.x)
-            self.try_attack(target)
+            self.try_attack(target, game.resolver)
         elif game.enemy_base_target and abs(self.x - game.enemy_base_target.x) <= self.attack_range:
-            self.try_attack(game.enemy_base_target)
+            self.try_attack(game.enemy_base_target, game.resolver)
         else:
             self.reset_state()
             self.move()
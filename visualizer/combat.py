@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+from core.combatlog import breakdown
+from visualizer.report import markdown_table
+
+DEFAULT_PATH = "game_data_combat.bin"
+
+def combine(sessions):
+    duration = sum(s["duration"] for s in sessions)
+    sources = defaultdict(lambda: {"damage": 0.0, "heal": 0.0, "hits": 0, "heals": 0, "targets": defaultdict(float)})
+    for session in sessions:
+        for name, stats in session["sources"].items():
+            total = sources[name]
+            for key in ("damage", "heal", "hits", "heals"):
+                total[key] += stats[key]
+            for target, amount in stats["targets"].items():
+                total["targets"][target] += amount
+    for stats in sources.values():
+        stats["dps"] = stats["damage"] / duration if duration else 0.0
+        stats["hps"] = stats["heal"] / duration if duration else 0.0
+    return {"start": sessions[0]["start"], "duration": duration, "events": sum(s["events"] for s in sessions),
+            "sources": sources}
+
+def source_rows(session):
+    rows = []
+    for name, s in sorted(session["sources"].items(), key=lambda item: -(item[1]["damage"] + item[1]["heal"])):
+        targets = sorted(s["targets"].items(), key=lambda item: -item[1])[:3]
+        rows.append((name, round(s["damage"]), round(s["dps"], 1), round(s["heal"]), round(s["hps"], 1),
+                     round(s["hits"]), round(s["heals"]), ", ".join(f"{t} {a:.0f}" for t, a in targets)))
+    return rows
+
+def to_markdown(title, session):
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(session["start"]))
+    return "\n".join([
+        f"## {title}", "", f"started {started}, {session['duration']:.1f} s, {session['events']} logged events", "",
+        markdown_table(["source", "damage", "DPS", "healing", "HPS", "hits", "heals", "top targets"], source_rows(session)), "",
+    ])
+
+def to_json(session):
+    return dict(session, sources={name: dict(s, targets=dict(s["targets"])) for name, s in session["sources"].items()})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-source DPS/HPS breakdown from a combat log written with --combat-log")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--last", type=int, default=1, metavar="N", help="report the last N battles (0 for all)")
+    parser.add_argument("--format", choices=("json", "markdown"), default="markdown")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} not found; play with --combat-log to record one")
+    sessions = breakdown(args.path)
+    if not sessions:
+        parser.error(f"{args.path}: no combat log blocks")
+    selected = sessions[-args.last:] if args.last else sessions
+    if args.format == "json":
+        print(json.dumps({"combined": to_json(combine(selected)), "sessions": [to_json(s) for s in selected]}, indent=2))
+        return 0
+    out = ["# Combat log", ""]
+    if len(selected) > 1:
+        out.append(to_markdown(f"{len(selected)} battles combined", combine(selected)))
+    for i, session in enumerate(selected, len(sessions) - len(selected) + 1):
+        out.append(to_markdown(f"Battle {i}", session))
+    print("\n".join(out))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+from itertools import islice
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+
+DEFAULT_FILES = ("game_data.csv", "game_data_sessions.csv", "game_data_ticks.csv")
+CHUNK_SIZE = 10000
+HISTOGRAM_CAP = 20
+ABILITY_COLUMNS = {"Buff": "Attack_speed_Buff_Used", "AOE": "AOE_Used", "Group Heal": "GroupHeal_Used"}
+BUCKET_FORMATS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+def file_kind(header):
+    columns = set(header)
+    if {"Stage", "Result"} <= columns:
+        return "sessions"
+    if {"TotalEnergyUsed", "MostSpawnedHero"} <= columns:
+        return "snapshots"
+    if {"Ticks", "frame_time_mean"} <= columns:
+        return "ticks"
+    return None
+
+def chunks(reader, size):
+    while True:
+        rows = list(islice(reader, size))
+        if not rows:
+            return
+        yield rows
+
+def ratio(num, den):
+    return round(num / den, 4) if den else None
+
+class Report:
+    def __init__(self, bucket="day"):
+        self.bucket = bucket
+        self.files = {}
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+        self.snapshot_rows = 0
+        self.snapshot_sessions = 0
+        self.energy_used = 0
+        self.enemies_defeated = 0
+        self.heroes_defeated = 0
+        self.ability_totals = Counter()
+        self.ability_histograms = {name: Counter() for name in ABILITY_COLUMNS}
+        self.most_spawned = defaultdict(Counter)
+
+        self.stages = defaultdict(Counter)
+        self.spawns = defaultdict(Counter)
+
+        self.tick_rows = 0
+        self.ticks = 0
+        self.frame_time_total = 0.0
+        self.frame_time_max = 0.0
+
+    def bucket_of(self, timestamp):
+        return time.strftime(BUCKET_FORMATS[self.bucket], time.gmtime(timestamp))
+
+    def see_timestamp(self, timestamp):
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+    def add_file(self, path, chunk_size=CHUNK_SIZE):
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            kind = file_kind(header or [])
+            if kind is None:
+                raise ValueError(f"{path}: unrecognised CSV header")
+            col = {name: i for i, name in enumerate(header)}
+            add_rows = getattr(self, f"add_{kind}")
+            state = {}
+            rows = 0
+            for chunk in chunks(reader, chunk_size):
+                add_rows(chunk, col, state)
+                rows += len(chunk)
+        self.files[path] = {"kind": kind, "rows": rows}
+        return self
+
+    def add_snapshots(self, rows, col, state):
+        ts, energy, enemies, heroes = col["Timestamp"], col["TotalEnergyUsed"], col["EnemiesDefeated"], col["HeroesDefeated"]
+        hero, abilities = col["MostSpawnedHero"], [(name, col[c]) for name, c in ABILITY_COLUMNS.items()]
+        last_energy = state.get("energy")
+        for row in rows:
+            timestamp = float(row[ts])
+            self.see_timestamp(timestamp)
+            # TotalEnergyUsed is cumulative within a battle, so a drop marks a new one
+            used = int(row[energy])
+            if last_energy is None or used < last_energy:
+                self.snapshot_sessions += 1
+                self.energy_used += used
+            else:
+                self.energy_used += used - last_energy
+            last_energy = used
+            self.enemies_defeated += int(row[enemies])
+            self.heroes_defeated += int(row[heroes])
+            for name, i in abilities:
+                count = int(row[i])
+                self.ability_totals[name] += count
+                self.ability_histograms[name][min(count, HISTOGRAM_CAP)] += 1
+            if row[hero] != "None":
+                self.most_spawned[self.bucket_of(timestamp)][row[hero]] += 1
+        self.snapshot_rows += len(rows)
+        state["energy"] = last_energy
+
+    def add_sessions(self, rows, col, state):
+        ts, stage, result = col["Timestamp"], col["Stage"], col["Result"]
+        totals = [(key, col[c]) for key, c in (("ticks", "Ticks"), ("energy", "EnergySpent"),
+                                               ("enemies", "EnemiesDefeated"), ("heroes", "HeroesDefeated"))]
+        spawned = [(c[len("Spawned_"):], i) for c, i in col.items() if c.startswith("Spawned_")]
+        used = [(c[len("Used_"):], i) for c, i in col.items() if c.startswith("Used_")]
+        for row in rows:
+            timestamp = float(row[ts])
+            self.see_timestamp(timestamp)
+            stats = self.stages[int(row[stage])]
+            stats["played"] += 1
+            stats[row[result]] += 1
+            for key, i in totals:
+                stats[key] += int(float(row[i]))
+            bucket = self.spawns[self.bucket_of(timestamp)]
+            for name, i in spawned:
+                bucket[name] += int(row[i])
+            for name, i in used:
+                stats[f"used:{name}"] += int(row[i])
+
+    def add_ticks(self, rows, col, state):
+        ts, ticks, mean, peak = col["Timestamp"], col["Ticks"], col["frame_time_mean"], col["frame_time_max"]
+        for row in rows:
+            self.see_timestamp(float(row[ts]))
+            n = int(float(row[ticks]))
+            self.ticks += n
+            self.frame_time_total += float(row[mean]) * n
+            self.frame_time_max = max(self.frame_time_max, float(row[peak]))
+        self.tick_rows += len(rows)
+
+    def merge(self, other):
+        self.files.update(other.files)
+        for timestamp in (other.first_timestamp, other.last_timestamp):
+            if timestamp is not None:
+                self.see_timestamp(timestamp)
+        self.snapshot_rows += other.snapshot_rows
+        self.snapshot_sessions += other.snapshot_sessions
+        self.energy_used += other.energy_used
+        self.enemies_defeated += other.enemies_defeated
+        self.heroes_defeated += other.heroes_defeated
+        self.ability_totals.update(other.ability_totals)
+        for name, histogram in other.ability_histograms.items():
+            self.ability_histograms[name].update(histogram)
+        for target, source in ((self.most_spawned, other.most_spawned), (self.stages, other.stages), (self.spawns, other.spawns)):
+            for key, counts in source.items():
+                target[key].update(counts)
+        self.tick_rows += other.tick_rows
+        self.ticks += other.ticks
+        self.frame_time_total += other.frame_time_total
+        self.frame_time_max = max(self.frame_time_max, other.frame_time_max)
+        return self
+
+    def stage_summary(self):
+        summary = {}
+        for stage, s in sorted(self.stages.items()):
+            summary[stage] = {
+                "played": s["played"],
+                "wins": s["win"],
+                "losses": s["loss"],
+                "quits": s["quit"],
+                "win_rate": ratio(s["win"], s["played"] - s["quit"]),
+                "mean_ticks": ratio(s["ticks"], s["played"]),
+                "enemies_per_100_energy": ratio(100 * s["enemies"], s["energy"]),
+                "ability_usage": {k[len("used:"):]: v for k, v in s.items() if k.startswith("used:")},
+            }
+        return summary
+
+    def ability_summary(self):
+        total = sum(self.ability_totals.values())
+        summary = {}
+        for name in ABILITY_COLUMNS:
+            histogram = self.ability_histograms[name]
+            summary[name] = {
+                "total": self.ability_totals[name],
+                "share": ratio(self.ability_totals[name], total),
+                "mean_per_interval": ratio(self.ability_totals[name], self.snapshot_rows),
+                "per_interval_histogram": {(f"{k}+" if k == HISTOGRAM_CAP else str(k)): v for k, v in sorted(histogram.items())},
+            }
+        return summary
+
+    def trend(self, buckets):
+        return {bucket: dict(counts.most_common()) for bucket, counts in sorted(buckets.items())}
+
+    def result(self):
+        return {
+            "files": self.files,
+            "time_range": [self.first_timestamp, self.last_timestamp],
+            "snapshots": {
+                "rows": self.snapshot_rows,
+                "battles": self.snapshot_sessions,
+                "energy_used": self.energy_used,
+                "enemies_defeated": self.enemies_defeated,
+                "heroes_defeated": self.heroes_defeated,
+                "enemies_per_100_energy": ratio(100 * self.enemies_defeated, self.energy_used),
+                "kill_death_ratio": ratio(self.enemies_defeated, self.heroes_defeated),
+            },
+            "stages": self.stage_summary(),
+            "abilities": self.ability_summary(),
+            "hero_popularity": {
+                "bucket": self.bucket,
+                "spawns": self.trend(self.spawns),
+                "most_spawned_intervals": self.trend(self.most_spawned),
+            },
+            "frame_time": {
+                "ticks": self.ticks,
+                "mean_ms": ratio(1000 * self.frame_time_total, self.ticks),
+                "max_ms": round(1000 * self.frame_time_max, 4),
+            },
+        }
+
+def summarize_file(args):
+    path, bucket, chunk_size = args
+    return Report(bucket).add_file(path, chunk_size)
+
+def build_report(paths, bucket="day", chunk_size=CHUNK_SIZE, jobs=1):
+    report = Report(bucket)
+    tasks = [(path, bucket, chunk_size) for path in paths]
+    if jobs > 1 and len(paths) > 1:
+        with Pool(min(jobs, len(paths))) as pool:
+            for part in pool.imap_unordered(summarize_file, tasks):
+                report.merge(part)
+    else:
+        for task in tasks:
+            report.merge(summarize_file(task))
+    return report.result()
+
+def markdown_table(header, rows):
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join("" if v is None else str(v) for v in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+def to_markdown(result):
+    out = ["# Battle Heroes Defense report", ""]
+    first, last = result["time_range"]
+    if first is not None:
+        out.append(f"{len(result['files'])} files, {time.strftime('%Y-%m-%d %H:%M', time.gmtime(first))} to "
+                   f"{time.strftime('%Y-%m-%d %H:%M', time.gmtime(last))} UTC")
+        out.append("")
+
+    s = result["snapshots"]
+    out += ["## Overview", "", markdown_table(["metric", "value"], [
+        ("snapshot rows", s["rows"]), ("battles (from snapshots)", s["battles"]),
+        ("energy used", s["energy_used"]), ("enemies defeated", s["enemies_defeated"]),
+        ("heroes defeated", s["heroes_defeated"]), ("enemies per 100 energy", s["enemies_per_100_energy"]),
+        ("kill/death ratio", s["kill_death_ratio"]),
+    ]), ""]
+
+    out += ["## Win rate per stage", ""]
+    if result["stages"]:
+        out.append(markdown_table(
+            ["stage", "played", "wins", "losses", "quits", "win rate", "mean ticks", "enemies / 100 energy"],
+            [(stage, st["played"], st["wins"], st["losses"], st["quits"], st["win_rate"], st["mean_ticks"],
+              st["enemies_per_100_energy"]) for stage, st in result["stages"].items()]))
+    else:
+        out.append("No session data (game_data_sessions.csv).")
+    out.append("")
+
+    out += ["## Ability usage", "", markdown_table(
+        ["ability", "total", "share", "mean per interval", "per-interval histogram"],
+        [(name, a["total"], a["share"], a["mean_per_interval"],
+          ", ".join(f"{k}: {v}" for k, v in a["per_interval_histogram"].items()))
+         for name, a in result["abilities"].items()]), ""]
+
+    popularity = result["hero_popularity"]
+    trend = popularity["spawns"] or popularity["most_spawned_intervals"]
+    label = "spawns" if popularity["spawns"] else "intervals as most spawned"
+    heroes = sorted({hero for counts in trend.values() for hero in counts})
+    out += [f"## Hero popularity per {popularity['bucket']} ({label})", ""]
+    out.append(markdown_table([popularity["bucket"]] + heroes,
+                              [[bucket] + [counts.get(hero, 0) for hero in heroes] for bucket, counts in trend.items()]))
+    out.append("")
+
+    if result["frame_time"]["ticks"]:
+        ft = result["frame_time"]
+        out += ["## Frame time", "", f"{ft['ticks']} ticks, mean {ft['mean_ms']} ms, max {ft['max_ms']} ms", ""]
+    return "\n".join(out)
+
+def expand_paths(paths):
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".csv"))
+        else:
+            found.append(path)
+    return found
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-session report over game_data*.csv files, streamed in bounded memory")
+    parser.add_argument("paths", nargs="*", help="CSV files or directories (default: game_data*.csv in the working directory)")
+    parser.add_argument("--format", choices=("json", "markdown"), default="markdown")
+    parser.add_argument("--bucket", choices=sorted(BUCKET_FORMATS), default="day", help="time bucket for popularity trends")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows read per chunk")
+    parser.add_argument("--jobs", type=int, default=1, help="summarize files in parallel worker processes")
+    parser.add_argument("-o", "--output", help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths) if args.paths else [p for p in DEFAULT_FILES if os.path.exists(p)]
+    if not paths:
+        parser.error("no CSV files found")
+    result = build_report(paths, args.bucket, args.chunk_size, args.jobs)
+    text = json.dumps(result, indent=2) if args.format == "json" else to_markdown(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
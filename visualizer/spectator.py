@@ -0,0 +1,107 @@
+import sys
+import json
+import socket
+import argparse
+import pygame
+from core.screen import ScreenManager
+from core.broadcast import StateBroadcaster, StateDecoder, read_frames, BASE_KIND, ENEMY_KIND_OFFSET, DYING
+
+HERO_COLORS = [(240, 200, 40), (200, 200, 200), (150, 80, 220), (60, 200, 120)]
+ENEMY_COLORS = {"Blue_Slime": (50, 110, 230), "Green_Slime": (60, 170, 60), "Red_Slime": (220, 50, 50)}
+GROUND_Y = ScreenManager.HEIGHT // 2 + 50
+
+def connect(host, port):
+    sock = socket.create_connection((host, port), timeout=5)
+    sock.setblocking(False)
+    return sock
+
+def enemy_color(decoder, kind):
+    name = decoder.kind_name(kind)
+    return ENEMY_COLORS.get(name) or tuple(64 + (hash(name) >> shift) % 192 for shift in (0, 8, 16))
+
+def draw_state(surface, font, decoder):
+    surface.fill((30, 40, 30))
+    header = decoder.header
+    if header is None:
+        surface.blit(font.render("waiting for keyframe...", True, ScreenManager.WHITE), (10, 10))
+        return
+    scale = ScreenManager.WIDTH / max(header["world_width"], 1)
+    pygame.draw.line(surface, (90, 110, 90), (0, GROUND_Y), (ScreenManager.WIDTH, GROUND_Y), 2)
+    pygame.draw.rect(surface, ScreenManager.GREEN, (0, GROUND_Y - 40, 8, 40))
+
+    for nid, kind, state, x, y, health, max_health in decoder.units.values():
+        sx = int(x * scale)
+        if kind == BASE_KIND:
+            pygame.draw.rect(surface, ScreenManager.RED, (sx, GROUND_Y - 40, 8, 40))
+            continue
+        color = enemy_color(decoder, kind) if kind >= ENEMY_KIND_OFFSET else HERO_COLORS[kind]
+        if state == DYING:
+            color = tuple(c // 3 for c in color)
+        pygame.draw.rect(surface, color, (sx - 3, GROUND_Y - 14, 6, 14))
+        if state != DYING and max_health > 0:
+            pygame.draw.rect(surface, ScreenManager.RED, (sx - 4, GROUND_Y - 19, 8, 2))
+            pygame.draw.rect(surface, ScreenManager.GREEN, (sx - 4, GROUND_Y - 19, int(8 * max(health, 0) / max_health), 2))
+
+    for x, y in decoder.projectiles:
+        surface.fill((255, 140, 0), (int(x * scale) - 1, y - 1, 3, 3))
+
+    text = (f"tick {header['tick']}  stage {header['stage']}  energy {header['energy']:.0f}/{header['max_energy']:.0f}  "
+            f"base {header['player_base_health']:.0f} vs {header['enemy_base_health']:.0f}  units {len(decoder.units)}")
+    surface.blit(font.render(text, True, ScreenManager.WHITE), (10, 10))
+
+def run_window(sock):
+    for subsystem in ScreenManager.SUBSYSTEMS:
+        subsystem.init()
+    surface = pygame.display.set_mode((ScreenManager.WIDTH, ScreenManager.HEIGHT))
+    pygame.display.set_caption("Battle Heroes Defense - Spectator")
+    font = pygame.font.Font(None, 22)
+    clock = pygame.time.Clock()
+    decoder = StateDecoder()
+    buffer = bytearray()
+    connected = True
+    while connected:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                connected = False
+        frames, open_ = read_frames(sock, buffer)
+        connected = connected and open_
+        for frame in frames:
+            decoder.apply(frame)
+        draw_state(surface, font, decoder)
+        pygame.display.flip()
+        clock.tick(ScreenManager.FPS)
+    pygame.quit()
+
+def run_json(sock, out=sys.stdout):
+    sock.setblocking(True)
+    decoder = StateDecoder()
+    buffer = bytearray()
+    while True:
+        frames, open_ = read_frames(sock, buffer)
+        for frame in frames:
+            if decoder.apply(frame):
+                out.write(json.dumps(decoder.state()) + "\n")
+        out.flush()
+        if not open_:
+            return
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a battle broadcast by heros go!.py --broadcast")
+    parser.add_argument("--host", default=StateBroadcaster.HOST)
+    parser.add_argument("--port", type=int, default=StateBroadcaster.PORT)
+    parser.add_argument("--json", action="store_true", help="print each reconstructed state as a JSON line instead of rendering")
+    args = parser.parse_args(argv)
+    sock = connect(args.host, args.port)
+    try:
+        if args.json:
+            run_json(sock)
+        else:
+            run_window(sock)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        sock.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
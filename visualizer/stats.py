@@ -1,72 +1,167 @@
+import io
+import os
+import queue
 import tkinter as tk
 from tkinter import ttk
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+class TelemetryCache:
+    # game_data.csv is only ever appended to, so after the first parse only the new tail is read
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.df = None
+        self.offset = 0
+        self.mtime = None
+
+    def refresh(self):
+        # returns (rebuilt, new_rows); (False, 0) means the cached frame is still current
+        stat = os.stat(self.csv_path)
+        if self.df is not None and (stat.st_size, stat.st_mtime_ns) == (self.offset, self.mtime):
+            return False, 0
+        rebuilt = self.df is None or stat.st_size < self.offset
+        with open(self.csv_path, "rb") as f:
+            if not rebuilt:
+                f.seek(self.offset)
+            data = f.read()
+        # stop at the last complete line in case the tracker is mid-write
+        end = data.rfind(b"\n") + 1
+        if rebuilt:
+            self.df = pd.read_csv(io.BytesIO(data[:end]))
+            added = len(self.df)
+        elif end:
+            new = pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.df.columns)
+            self.df = pd.concat([self.df, new], ignore_index=True)
+            added = len(new)
+        else:
+            added = 0
+        self.offset = (0 if rebuilt else self.offset) + end
+        self.mtime = stat.st_mtime_ns
+        return rebuilt, added
+
 class StatsVisualizer:
+    # one long-lived worker per game: the window is hidden rather than destroyed, and figures are only
+    # redrawn when new telemetry has been appended since they were last drawn
+    PLOTS = (
+        ("Enemies vs Heroes", "_plot_enemies_vs_heroes"),
+        ("Energy Usage", "_plot_energy"),
+        ("Ability Usage", "_plot_abilities"),
+        ("Most Spawned Hero", "_plot_most_spawned"),
+    )
+    POLL_MS = 50
+    REFRESH_MS = 2000
+
     def __init__(self, csv_path="game_data.csv", parent=None):
         self.csv_path = csv_path
-        self.df = None
+        self.cache = TelemetryCache(csv_path)
         self.parent = parent
         self.root = None
+        self.window = None
         self.status_label = None
+        self.plots = []
+        self.tree = None
 
-    @staticmethod
-    def launch_in_new_process():
-        vis = StatsVisualizer()
-        vis.show()
+    @property
+    def df(self):
+        return self.cache.df
 
     def moving_average(self, data, window_size=3):
         return pd.Series(data).rolling(window=window_size, min_periods=1).mean()
 
-    def show(self):
+    def serve(self, requests):
         self.root = tk.Tk()
-        self.root.title("Battle Heroes Defense Analytics")
-        self.root.geometry("1000x600")
-        self.status_label = ttk.Label(self.root, text="Loading stats...", anchor='center')
-        self.status_label.pack(expand=True)
-        self.root.after(10, self._build_ui_async)
+        self.root.withdraw()
+        self.poll_requests(requests)
         self.root.mainloop()
 
-    def _build_ui_async(self):
+    def poll_requests(self, requests):
+        while True:
+            try:
+                request = requests.get_nowait()
+            except queue.Empty:
+                break
+            if request == "show":
+                self.show()
+            elif request == "stop":
+                self.root.destroy()
+                return
+        self.root.after(self.POLL_MS, self.poll_requests, requests)
+
+    def show(self):
+        if self.window is None:
+            self._build_window()
+            self.root.after(10, self.refresh)
+            self.root.after(self.REFRESH_MS, self._auto_refresh)
+        else:
+            self.refresh()
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+
+    def hide(self):
+        self.window.withdraw()
+
+    def _build_window(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Battle Heroes Defense Analytics")
+        self.window.geometry("1000x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+        self.status_label = ttk.Label(self.window, text="Loading stats...", anchor='center')
+        self.status_label.pack(expand=True)
+
+    def _build_tabs(self):
         self.status_label.destroy()
-        self.df = pd.read_csv(self.csv_path)
-        notebook = ttk.Notebook(self.root)
+        notebook = ttk.Notebook(self.window)
         notebook.pack(fill='both', expand=True)
-        self._plot_enemies_vs_heroes(notebook)
-        self._plot_energy(notebook)
-        self._plot_abilities(notebook)
-        self._plot_most_spawned(notebook)
-        self._show_data_table(notebook)
-        ttk.Button(self.root, text="Close", command=self.root.destroy).pack(pady=10)
-
-    def _plot_enemies_vs_heroes(self, notebook):
-        frame = ttk.Frame(notebook)
-        fig, ax = plt.subplots()
+        for title, method in self.PLOTS:
+            frame = ttk.Frame(notebook)
+            fig = Figure()
+            ax = fig.add_subplot()
+            canvas = FigureCanvasTkAgg(fig, frame)
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+            notebook.add(frame, text=title)
+            self.plots.append((ax, canvas, getattr(self, method)))
+        self._build_data_table(notebook)
+        ttk.Button(self.window, text="Close", command=self.hide).pack(pady=10)
+
+    def _auto_refresh(self):
+        if self.window.state() != "withdrawn":
+            self.refresh()
+        self.root.after(self.REFRESH_MS, self._auto_refresh)
+
+    def refresh(self):
+        if not os.path.exists(self.csv_path):
+            if not self.plots:
+                self.status_label.config(text="No stats recorded yet")
+            return
+        rebuilt, added = self.cache.refresh()
+        if not self.plots:
+            self._build_tabs()
+        elif not added and not rebuilt:
+            return
+        for ax, canvas, plot in self.plots:
+            ax.clear()
+            plot(ax)
+            canvas.draw_idle()
+        self._update_data_table(rebuilt, added)
+
+    def _plot_enemies_vs_heroes(self, ax):
         ax.plot(self.df['EnemiesDefeated'], label='Enemies Defeated')
         ax.plot(self.df['HeroesDefeated'], label='Heroes Defeated')
         ax.set_title('Enemies vs Heroes Defeated')
         ax.set_xlabel('Session (Every 5 sec)')
         ax.set_ylabel('Count')
         ax.legend()
-        FigureCanvasTkAgg(fig, frame).get_tk_widget().pack(fill='both', expand=True)
-        notebook.add(frame, text="Enemies vs Heroes")
 
-    def _plot_energy(self, notebook):
-        frame = ttk.Frame(notebook)
-        fig, ax = plt.subplots()
+    def _plot_energy(self, ax):
         ax.plot(self.df['TotalEnergyUsed'], color='tab:blue')
         ax.set_title('Total Energy Used Over Time')
         ax.set_xlabel('Session (Every 5 sec)')
         ax.set_ylabel('Energy Used')
-        FigureCanvasTkAgg(fig, frame).get_tk_widget().pack(fill='both', expand=True)
-        notebook.add(frame, text="Energy Usage")
 
-    def _plot_abilities(self, notebook):
-        frame = ttk.Frame(notebook)
-        fig, ax = plt.subplots()
+    def _plot_abilities(self, ax):
         ax.plot(self.moving_average(self.df['Attack_speed_Buff_Used']), label='Buff')
         ax.plot(self.moving_average(self.df['AOE_Used']), label='AOE')
         ax.plot(self.moving_average(self.df['GroupHeal_Used']), label='Heal')
@@ -74,36 +169,34 @@ class StatsVisualizer:
         ax.set_xlabel('Session (Every 5 sec)')
         ax.set_ylabel('Ability Count')
         ax.legend()
-        FigureCanvasTkAgg(fig, frame).get_tk_widget().pack(fill='both', expand=True)
-        notebook.add(frame, text="Ability Usage")
 
-    def _plot_most_spawned(self, notebook):
-        frame = ttk.Frame(notebook)
-        fig, ax = plt.subplots()
+    def _plot_most_spawned(self, ax):
         df_non_none = self.df[self.df['MostSpawnedHero'] != 'None']
-        sns.stripplot(data=df_non_none, x=df_non_none.index, y='MostSpawnedHero', ax=ax, jitter=True, size=5)
+        if not df_non_none.empty:
+            sns.stripplot(data=df_non_none, x=df_non_none.index, y='MostSpawnedHero', ax=ax, jitter=True, size=5)
         ax.set_title('Most Spawned Hero Over Time')
         ax.set_xlabel('Session (Every 5 sec)')
         ax.set_ylabel('Hero')
-        FigureCanvasTkAgg(fig, frame).get_tk_widget().pack(fill='both', expand=True)
-        notebook.add(frame, text="Most Spawned Hero")
-        
-    def _show_data_table(self, notebook):
+
+    def _build_data_table(self, notebook):
         frame = ttk.Frame(notebook)
-        tree = ttk.Treeview(frame)
-        tree.pack(fill='both', expand=True)
+        self.tree = ttk.Treeview(frame)
+        self.tree.pack(fill='both', expand=True)
 
         # Read CSV headers
         columns = list(self.df.columns)
-        tree["columns"] = columns
-        tree["show"] = "headings"
+        self.tree["columns"] = columns
+        self.tree["show"] = "headings"
 
         for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=100, anchor="center")
-
-        for _, row in self.df.iterrows():
-            tree.insert("", "end", values=list(row))
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100, anchor="center")
 
         notebook.add(frame, text="Data Table")
 
+    def _update_data_table(self, rebuilt, added):
+        # rows already in the table stay; only the appended tail is inserted
+        if rebuilt:
+            self.tree.delete(*self.tree.get_children())
+        for row in self.df.tail(added).itertuples(index=False):
+            self.tree.insert("", "end", values=list(row))